@@ -3,26 +3,41 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import platform
 import shutil
 import socket
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 BACKEND_DIR = ROOT / "backend"
 FRONTEND_DIR = ROOT / "frontend"
 VENV_DIR = BACKEND_DIR / ".venv"
+STATIC_DIR = BACKEND_DIR / "app" / "static"
+FINGERPRINT_FILE = ROOT / ".launch-cache.json"
 IS_WINDOWS = platform.system() == "Windows"
 DEFAULT_PORT = 3000
 
 DEBUG = False
+REBUILD = False
+TIMINGS: list[tuple[str, float]] = []
+FINGERPRINT_LOCK = threading.Lock()
 
 
 # Helpers
 
 
+class LaunchError(Exception):
+    """A stage failed. Raised rather than sys.exit() so worker threads can fail too."""
+
+
 def header(msg: str) -> None:
     """Stage title -- always printed, in both quiet and debug mode."""
     print(f"\n\033[1;36m==> {msg}\033[0m")
@@ -34,9 +49,9 @@ def run(cmd: list[str], cwd: Path, label: str) -> None:
         try:
             subprocess.run(cmd, cwd=cwd, check=True)
         except FileNotFoundError as exc:
-            sys.exit(f"\n✗ {label} failed: command not found -> {exc}")
+            raise LaunchError(f"\n✗ {label} failed: command not found -> {exc}")
         except subprocess.CalledProcessError as exc:
-            sys.exit(
+            raise LaunchError(
                 f"\n✗ {label} failed (exit code {exc.returncode}). "
                 "Aborting -- backend will not start."
             )
@@ -51,24 +66,77 @@ def run(cmd: list[str], cwd: Path, label: str) -> None:
                 text=True,
             )
         except FileNotFoundError as exc:
-            sys.exit(f"\n✗ {label} failed: command not found -> {exc}")
+            raise LaunchError(f"\n✗ {label} failed: command not found -> {exc}")
         except subprocess.CalledProcessError as exc:
             print(f"\n--- output from: {' '.join(cmd)} ---")
             print(exc.stdout)
             print("--- end output ---")
-            sys.exit(
+            raise LaunchError(
                 f"\n✗ {label} failed (exit code {exc.returncode}). "
                 "Aborting -- backend will not start. "
                 "(Re-run with --debug to see live output as it happens.)"
             )
 
 
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMINGS.append((stage, time.perf_counter() - start))
+
+
+def print_timings(total: float) -> None:
+    header("Launch timings")
+    for stage, seconds in TIMINGS:
+        print(f"    {stage:<32} {seconds:>6.1f}s")
+    print(f"    {'total (wall clock)':<32} {total:>6.1f}s")
+
+
+# Fingerprints -- skip installs and builds whose inputs have not changed
+
+
+def fingerprint(*paths: Path) -> str:
+    """Content hash of the given files and directory trees (missing ones count too)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            digest.update(str(file.relative_to(ROOT)).encode())
+            digest.update(file.read_bytes() if file.is_file() else b"<missing>")
+    return digest.hexdigest()
+
+
+def load_fingerprints() -> dict[str, str]:
+    try:
+        return json.loads(FINGERPRINT_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_fingerprint(stage: str, value: str) -> None:
+    """Recorded only after the stage succeeded, so a failed build is retried."""
+    with FINGERPRINT_LOCK:
+        fingerprints = load_fingerprints()
+        fingerprints[stage] = value
+        FINGERPRINT_FILE.write_text(json.dumps(fingerprints, indent=2))
+
+
+def up_to_date(stage: str, value: str, output: Path) -> bool:
+    return (
+        not REBUILD
+        and output.exists()
+        and load_fingerprints().get(stage) == value
+    )
+
+
 def require_tool(name: str, install_hint: str | None = None) -> None:
     if shutil.which(name) is None:
         msg = f"✗ '{name}' was not found on PATH."
         if install_hint:
             msg += f"\n  {install_hint}"
-        sys.exit(msg)
+        raise LaunchError(msg)
 
 
 def venv_paths() -> tuple[Path, Path]:
@@ -112,8 +180,14 @@ def run_server(cmd: list[str], cwd: Path, port: int) -> None:
 
 
 def setup_backend_uv() -> None:
+    value = fingerprint(BACKEND_DIR / "pyproject.toml", BACKEND_DIR / "uv.lock")
+    if up_to_date("backend-uv", value, VENV_DIR):
+        header("Backend dependencies unchanged -- skipping uv sync")
+        return
     header("Syncing backend dependencies (uv sync)")
-    run(["uv", "sync"], cwd=BACKEND_DIR, label="uv sync")
+    with timed("uv sync"):
+        run(["uv", "sync"], cwd=BACKEND_DIR, label="uv sync")
+    save_fingerprint("backend-uv", value)
 
 
 def start_backend_uv(port: int) -> None:
@@ -127,32 +201,41 @@ def start_backend_uv(port: int) -> None:
 def setup_backend_pip() -> Path:
     """Returns the path to the fastapi CLI inside the fallback venv."""
     python_exe, scripts_dir = venv_paths()
+    fastapi_bin = scripts_dir / ("fastapi.exe" if IS_WINDOWS else "fastapi")
+    value = fingerprint(BACKEND_DIR / "requirements.txt") + sys.version
+    if python_exe.exists() and up_to_date("backend-pip", value, fastapi_bin):
+        header("Backend requirements unchanged -- reusing backend/.venv as is")
+        return fastapi_bin
 
     if not python_exe.exists():
         header("uv not found -- creating a plain venv instead (backend/.venv)")
-        run(
-            [sys.executable, "-m", "venv", str(VENV_DIR)],
-            cwd=ROOT,
-            label="venv creation",
-        )
+        with timed("venv creation"):
+            run(
+                [sys.executable, "-m", "venv", str(VENV_DIR)],
+                cwd=ROOT,
+                label="venv creation",
+            )
     else:
         header("Reusing existing backend/.venv")
 
     header("Upgrading pip")
-    run(
-        [str(python_exe), "-m", "pip", "install", "--upgrade", "pip"],
-        cwd=BACKEND_DIR,
-        label="pip upgrade",
-    )
+    with timed("pip upgrade"):
+        run(
+            [str(python_exe), "-m", "pip", "install", "--upgrade", "pip"],
+            cwd=BACKEND_DIR,
+            label="pip upgrade",
+        )
 
     header("Installing backend requirements (requirements.txt)")
-    run(
-        [str(python_exe), "-m", "pip", "install", "-r", "requirements.txt"],
-        cwd=BACKEND_DIR,
-        label="backend dependency install",
-    )
+    with timed("pip install -r requirements.txt"):
+        run(
+            [str(python_exe), "-m", "pip", "install", "-r", "requirements.txt"],
+            cwd=BACKEND_DIR,
+            label="backend dependency install",
+        )
 
-    return scripts_dir / ("fastapi.exe" if IS_WINDOWS else "fastapi")
+    save_fingerprint("backend-pip", value)
+    return fastapi_bin
 
 
 def start_backend_pip(fastapi_bin: Path, port: int) -> None:
@@ -169,14 +252,45 @@ def start_backend_pip(fastapi_bin: Path, port: int) -> None:
 # Frontend
 
 
+FRONTEND_LOCKFILES = ("package.json", "package-lock.json")
+FRONTEND_BUILD_INPUTS = (
+    "src",
+    "public",
+    "index.html",
+    "vite.config.ts",
+    "postcss.config.mjs",
+    "package.json",
+    "package-lock.json",
+)
+
+
 def build_frontend() -> None:
+    deps = fingerprint(*(FRONTEND_DIR / name for name in FRONTEND_LOCKFILES))
+    build = fingerprint(*(FRONTEND_DIR / name for name in FRONTEND_BUILD_INPUTS))
+    install_needed = not up_to_date(
+        "frontend-deps", deps, FRONTEND_DIR / "node_modules"
+    )
+    build_needed = not up_to_date(
+        "frontend-build", build, STATIC_DIR / "index.html"
+    )
+    if not install_needed and not build_needed:
+        header("Frontend unchanged -- skipping npm install and build")
+        return
+
     require_tool("npm")
 
-    header("Installing frontend dependencies (npm install)")
-    run(["npm", "install"], cwd=FRONTEND_DIR, label="npm install")
+    if install_needed:
+        header("Installing frontend dependencies (npm install)")
+        with timed("npm install"):
+            run(["npm", "install"], cwd=FRONTEND_DIR, label="npm install")
+        save_fingerprint("frontend-deps", deps)
+    else:
+        header("Frontend dependencies unchanged -- skipping npm install")
 
     header("Building frontend (npm run build)")
-    run(["npm", "run", "build"], cwd=FRONTEND_DIR, label="frontend build")
+    with timed("npm run build"):
+        run(["npm", "run", "build"], cwd=FRONTEND_DIR, label="frontend build")
+    save_fingerprint("frontend-build", build)
 
 
 # Main
@@ -198,14 +312,22 @@ def parse_args() -> argparse.Namespace:
         help="Verbose output: show every command run, its full live output, "
         "and live server logs.",
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore cached fingerprints: re-sync dependencies and rebuild "
+        "the frontend even if nothing changed.",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
-    global DEBUG
+    global DEBUG, REBUILD
 
+    started = time.perf_counter()
     args = parse_args()
     DEBUG = args.debug
+    REBUILD = args.rebuild
 
     if not BACKEND_DIR.is_dir() or not FRONTEND_DIR.is_dir():
         sys.exit(
@@ -216,17 +338,22 @@ def main() -> None:
     use_uv = shutil.which("uv") is not None
     fastapi_bin: Path | None = None
 
-    if use_uv:
-        setup_backend_uv()
-    else:
-        print(
-            "\n(i) 'uv' not found on PATH -- falling back to venv + pip.\n"
-            "    For faster, more reliable installs, consider installing uv:\n"
-            "    https://docs.astral.sh/uv/getting-started/installation/"
-        )
-        fastapi_bin = setup_backend_pip()
+    # The frontend build and the backend install touch different directories,
+    # so they run side by side; a failure in either aborts the launch.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        frontend = pool.submit(build_frontend)
+        if use_uv:
+            setup_backend_uv()
+        else:
+            print(
+                "\n(i) 'uv' not found on PATH -- falling back to venv + pip.\n"
+                "    For faster, more reliable installs, consider installing uv:\n"
+                "    https://docs.astral.sh/uv/getting-started/installation/"
+            )
+            fastapi_bin = setup_backend_pip()
+        frontend.result()
 
-    build_frontend()
+    print_timings(time.perf_counter() - started)
 
     port = find_available_port(DEFAULT_PORT)
     if port != DEFAULT_PORT:
@@ -242,6 +369,8 @@ def main() -> None:
 if __name__ == "__main__":
     try:
         main()
+    except LaunchError as exc:
+        sys.exit(str(exc))
     except KeyboardInterrupt:
         print("\n\n==> Stopped.")
         sys.exit(0)
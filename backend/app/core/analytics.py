@@ -0,0 +1,200 @@
+import functools
+import importlib.util
+import math
+from typing import Optional
+
+from app.schemas.analytics import (
+    AnalyticsResponse,
+    Backlog,
+    ComponentDistribution,
+    CreditSummary,
+    SemesterTrend,
+)
+from app.schemas.result import ResultResponse
+
+# NumPy is optional (the "analytics" extra); analytics routes answer 503
+# without it. It is imported on the first analysis, so it stays off the
+# startup path.
+ANALYTICS = importlib.util.find_spec("numpy") is not None
+
+
+@functools.cache
+def _np():
+    import numpy
+
+    return numpy
+
+COMPONENTS = ("ese_marks", "ia_marks", "viva_marks", "total_marks")
+FAIL_MARKS = ("F", "FAIL", "AB", "ABSENT")
+HISTOGRAM_BINS = 10
+
+
+def number(value: Optional[str]) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def rounded(value, digits: int = 2) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else round(value, digits)
+
+
+class ResultHistory:
+    # A student's results as parallel NumPy columns: one row per subject
+    # attempt in exam order, plus one row per exam for the portal's reported
+    # SGPA/CGPA. The portal's strings are parsed once here; every aggregate
+    # below is array arithmetic over these columns.
+    def __init__(self, results: list[tuple[Optional[str], ResultResponse]]):
+        np = _np()
+        self.exam_nos = [exam_no for exam_no, _ in results]
+        self.sems = [data.student_details.sem for _, data in results]
+        rows = [(i, subject) for i, (_, data) in enumerate(results) for subject in data.subjects]
+        n = len(rows)
+
+        def column(field: str):
+            return np.fromiter(
+                (number(getattr(subject, field)) for _, subject in rows),
+                dtype=np.float64,
+                count=n,
+            )
+
+        def text(field: str):
+            return np.char.upper(
+                np.array([(getattr(s, field) or "").strip() for _, s in rows], dtype=str)
+            )
+
+        self.exam = np.fromiter((i for i, _ in rows), dtype=np.intp, count=n)
+        self.subjects = np.array([s.sub or "" for _, s in rows], dtype=str)
+        self.credits = np.nan_to_num(column("credits"))
+        self.grade_points = column("grade_points")
+        credit_points = column("credit_points")
+        # Recompute credit points the portal left blank.
+        self.credit_points = np.nan_to_num(
+            np.where(
+                np.isnan(credit_points), self.grade_points * self.credits, credit_points
+            )
+        )
+        self.marks = {field: column(field) for field in COMPONENTS}
+        self.failed = np.isin(text("remarks"), FAIL_MARKS) | np.isin(
+            text("grade"), FAIL_MARKS
+        )
+
+        info = [data.result for _, data in results]
+        self.reported_sgpa = np.array([number(r.sgpa) for r in info], dtype=np.float64)
+        self.reported_cgpa = np.array([number(r.cgpa) for r in info], dtype=np.float64)
+        self.percentage = np.array([number(r.percentage) for r in info], dtype=np.float64)
+
+        # Attempts of the same subject, and which one is the latest.
+        self.keys, self.inverse = np.unique(self.subjects, return_inverse=True)
+        self.latest = np.full(len(self.keys), -1, dtype=np.intp)
+        np.maximum.at(self.latest, self.inverse, np.arange(n))
+
+    def trend(self) -> list[SemesterTrend]:
+        np = _np()
+        m = len(self.exam_nos)
+        credits = np.bincount(self.exam, weights=self.credits, minlength=m)
+        points = np.bincount(self.exam, weights=self.credit_points, minlength=m)
+        earned = np.bincount(
+            self.exam, weights=self.credits * ~self.failed, minlength=m
+        )
+        counts = np.bincount(self.exam, minlength=m)
+
+        # A retake replaces the earlier attempt in the running CGPA: each row
+        # counts from its own exam until the subject's next attempt.
+        order = np.lexsort((np.arange(len(self.exam)), self.inverse))
+        next_exam = np.full(len(self.exam), m, dtype=np.intp)
+        same = self.inverse[order][1:] == self.inverse[order][:-1]
+        next_exam[order[:-1][same]] = self.exam[order[1:][same]]
+
+        def running(weights):
+            added = np.bincount(self.exam, weights=weights, minlength=m + 1)
+            removed = np.bincount(next_exam, weights=weights, minlength=m + 1)
+            return np.cumsum(added - removed)[:m]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sgpa = points / credits
+            cgpa = running(self.credit_points) / running(self.credits)
+
+        return [
+            SemesterTrend(
+                exam_no=self.exam_nos[i],
+                sem=self.sems[i],
+                subjects=int(counts[i]),
+                credits=float(credits[i]),
+                earned_credits=float(earned[i]),
+                sgpa=rounded(sgpa[i]),
+                cgpa=rounded(cgpa[i]),
+                reported_sgpa=rounded(self.reported_sgpa[i]),
+                reported_cgpa=rounded(self.reported_cgpa[i]),
+                percentage=rounded(self.percentage[i]),
+            )
+            for i in range(m)
+        ]
+
+    def distribution(self) -> dict[str, ComponentDistribution]:
+        np = _np()
+        distribution = {}
+        for field, marks in self.marks.items():
+            values = marks[~np.isnan(marks)]
+            if not values.size:
+                distribution[field] = ComponentDistribution(count=0)
+                continue
+            p25, median, p75 = np.percentile(values, (25, 50, 75))
+            histogram, bins = np.histogram(values, bins=HISTOGRAM_BINS)
+            distribution[field] = ComponentDistribution(
+                count=int(values.size),
+                mean=rounded(values.mean()),
+                std=rounded(values.std()),
+                min=rounded(values.min()),
+                p25=rounded(p25),
+                median=rounded(median),
+                p75=rounded(p75),
+                max=rounded(values.max()),
+                bins=[rounded(edge) for edge in bins],
+                histogram=histogram.tolist(),
+            )
+        return distribution
+
+    def backlogs(self) -> list[Backlog]:
+        np = _np()
+        attempts = np.bincount(self.inverse, minlength=len(self.keys))
+        failures = np.bincount(self.inverse, weights=self.failed, minlength=len(self.keys))
+        return [
+            Backlog(
+                sub=str(self.keys[j]) or None,
+                attempts=int(attempts[j]),
+                cleared=not self.failed[self.latest[j]],
+                last_exam_no=self.exam_nos[self.exam[self.latest[j]]],
+            )
+            for j in np.flatnonzero(failures)
+        ]
+
+    def summary(self) -> CreditSummary:
+        np = _np()
+        latest = self.latest
+        credits = self.credits[latest].sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cgpa = self.credit_points[latest].sum() / credits
+        active = int(self.failed[latest].sum())
+        ever_failed = np.bincount(
+            self.inverse, weights=self.failed, minlength=len(self.keys)
+        )
+        return CreditSummary(
+            credits=float(credits),
+            earned_credits=float(self.credits[latest][~self.failed[latest]].sum()),
+            cgpa=rounded(cgpa),
+            reported_cgpa=rounded(self.reported_cgpa[-1]) if self.exam_nos else None,
+            active_backlogs=active,
+            cleared_backlogs=int((ever_failed > 0).sum()) - active,
+        )
+
+    def analyze(self) -> AnalyticsResponse:
+        return AnalyticsResponse(
+            exams=len(self.exam_nos),
+            summary=self.summary(),
+            trend=self.trend(),
+            distribution=self.distribution(),
+            backlogs=self.backlogs(),
+        )
@@ -0,0 +1,228 @@
+import asyncio
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import orjson
+
+from app.core.cache import session_key
+from app.core.config import settings
+from app.schemas.result import ResultResponse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    reg_no TEXT NOT NULL,
+    exam_no TEXT NOT NULL,
+    rv_result_date TEXT NOT NULL DEFAULT '',
+    payload BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (reg_no, exam_no)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    reg_no TEXT NOT NULL,
+    seen_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class ResultArchive:
+    # Published results do not change unless re-evaluated, so they are kept on
+    # disk keyed by (reg_no, exam_no) and served from memory once loaded.
+    # Archived rows are only handed to sessions that the portal itself has
+    # tied to that reg_no through getResAll. SQLite calls run on one worker
+    # thread, as for the SQLite response cache, so they never block the loop.
+    def __init__(self, path: str):
+        self.path = path
+        self.db: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        self._results: dict[tuple[str, str], tuple[str, ResultResponse]] = {}
+        self._sessions: dict[str, tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _call(self, method: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, method, *args
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        self.db.execute(sql, params)
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        return self.db.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> list[tuple]:
+        return self.db.execute(sql, params).fetchall()
+
+    async def open(self) -> None:
+        if self.db is not None or not settings.archive_enabled:
+            return
+        self.db = await self._call(self._connect)
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Every student's marks end up here: keep the file private to this
+        # user. SQLite gives -wal/-shm the same mode.
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        db.execute(
+            "DELETE FROM sessions WHERE seen_at < ?",
+            (time.time() - settings.archive_session_ttl,),
+        )
+        return db
+
+    async def close(self) -> None:
+        if self.db is None:
+            return
+        db, self.db = self.db, None
+        await self._call(db.close)
+        self._results.clear()
+        self._sessions.clear()
+
+    async def bind(self, token: str, reg_no: str) -> None:
+        if self.db is None or not reg_no:
+            return
+        session = session_key(token)
+        now = time.time()
+        self._sessions[session] = (reg_no, now)
+        await self._call(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions (session, reg_no, seen_at) VALUES (?, ?, ?)",
+            (session, reg_no, now),
+        )
+
+    async def unbind(self, token: str) -> None:
+        if self.db is None:
+            return
+        session = session_key(token)
+        self._sessions.pop(session, None)
+        await self._call(
+            self._execute, "DELETE FROM sessions WHERE session = ?", (session,)
+        )
+
+    async def owner(self, token: str) -> Optional[str]:
+        if self.db is None:
+            return None
+        session = session_key(token)
+        entry = self._sessions.get(session)
+        if entry is None:
+            row = await self._call(
+                self._fetchone,
+                "SELECT reg_no, seen_at FROM sessions WHERE session = ?",
+                (session,),
+            )
+            if row is None:
+                return None
+            entry = self._sessions[session] = (row[0], row[1])
+        reg_no, seen_at = entry
+        if seen_at < time.time() - settings.archive_session_ttl:
+            return None
+        return reg_no
+
+    async def get(
+        self, token: str, reg_no: str, exam_no: str
+    ) -> Optional[ResultResponse]:
+        if await self.owner(token) != reg_no:
+            return None
+        entry = await self._load(reg_no, exam_no)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    async def revisions(self, reg_no: str) -> dict[str, str]:
+        if self.db is None:
+            return {}
+        return dict(
+            await self._call(
+                self._fetchall,
+                "SELECT exam_no, rv_result_date FROM results WHERE reg_no = ?",
+                (reg_no,),
+            )
+        )
+
+    async def exams(self, token: str) -> list[tuple[str, str, ResultResponse]]:
+        reg_no = await self.owner(token)
+        if reg_no is None:
+            return []
+        archived = []
+        for exam_no in await self.revisions(reg_no):
+            entry = await self._load(reg_no, exam_no)
+            if entry is not None:
+                archived.append((reg_no, exam_no, entry[1]))
+        return archived
+
+    async def store(
+        self,
+        reg_no: str,
+        exam_no: str,
+        result: ResultResponse,
+        rv_result_date: Optional[str] = None,
+    ) -> None:
+        if self.db is None or not reg_no or not exam_no:
+            return
+        revision = rv_result_date or ""
+        self._results[(reg_no, exam_no)] = (revision, result)
+        await self._call(
+            self._execute,
+            "INSERT OR REPLACE INTO results "
+            "(reg_no, exam_no, rv_result_date, payload, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                reg_no,
+                exam_no,
+                revision,
+                orjson.dumps(result.model_dump()),
+                time.time(),
+            ),
+        )
+
+    async def _load(
+        self, reg_no: str, exam_no: str
+    ) -> Optional[tuple[str, ResultResponse]]:
+        entry = self._results.get((reg_no, exam_no))
+        if entry is not None or self.db is None:
+            return entry
+        entry = await self._call(self._read, reg_no, exam_no)
+        if entry is not None:
+            self._results[(reg_no, exam_no)] = entry
+        return entry
+
+    def _read(self, reg_no: str, exam_no: str) -> Optional[tuple[str, ResultResponse]]:
+        row = self._fetchone(
+            "SELECT rv_result_date, payload FROM results WHERE reg_no = ? AND exam_no = ?",
+            (reg_no, exam_no),
+        )
+        if row is None:
+            return None
+        return row[0], ResultResponse.model_validate(orjson.loads(row[1]))
+
+    async def stats(self) -> dict:
+        if self.db is None:
+            return {"enabled": False}
+        results, students = await self._call(
+            self._fetchone, "SELECT COUNT(*), COUNT(DISTINCT reg_no) FROM results"
+        )
+        (sessions,) = await self._call(self._fetchone, "SELECT COUNT(*) FROM sessions")
+        return {
+            "enabled": True,
+            "path": self.path,
+            "results": results,
+            "students": students,
+            "sessions": sessions,
+            "loaded": len(self._results),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+result_archive = ResultArchive(settings.archive_path)
@@ -0,0 +1,178 @@
+import math
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+SUCCESS = "success"
+FAILURE = "failure"
+TIMEOUT = "timeout"
+
+breaker_state = registry.register(
+    Gauge(
+        "uniclare_circuit_state",
+        "Circuit breaker state per upstream endpoint (0 closed, 1 half-open, 2 open).",
+        ("endpoint",),
+    )
+)
+breaker_rejections = registry.register(
+    Counter(
+        "uniclare_circuit_rejections_total",
+        "Upstream calls failed fast by an open circuit.",
+        ("endpoint",),
+    )
+)
+
+
+class CircuitOpenError(httpx.TransportError):
+    # Raised by the transport when an endpoint's circuit is open, so it reads
+    # like any other upstream failure to httpx and its callers. Routes turn it
+    # into a 503 with Retry-After via http_error().
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Upstream '{endpoint}' is unavailable, retry later")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def http_error(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(self),
+            headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+        )
+
+
+class CircuitBreaker:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+        # (timestamp, outcome) for calls inside the rolling window
+        self.calls: deque[tuple[float, str]] = deque()
+        self.failures = 0
+        self.timeouts = 0
+        breaker_state.set(endpoint, value=STATE_VALUES[CLOSED])
+
+    def _prune(self, now: float) -> None:
+        horizon = now - settings.breaker_window
+        while self.calls and self.calls[0][0] < horizon:
+            _, outcome = self.calls.popleft()
+            if outcome != SUCCESS:
+                self.failures -= 1
+            if outcome == TIMEOUT:
+                self.timeouts -= 1
+
+    def _set_state(self, state: str, now: float) -> None:
+        self.state = state
+        breaker_state.set(self.endpoint, value=STATE_VALUES[state])
+        if state == OPEN:
+            self.opened_at = now
+            self.trips += 1
+        elif state == CLOSED:
+            self.calls.clear()
+            self.failures = 0
+            self.timeouts = 0
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.opened_at + settings.breaker_open_seconds - now)
+
+    def before(self) -> bool:
+        # Returns True when the admitted call is a half-open probe.
+        if not settings.breaker_enabled:
+            return False
+        now = time.monotonic()
+        if self.state == OPEN:
+            if self.retry_after(now) > 0:
+                breaker_rejections.inc(self.endpoint)
+                raise CircuitOpenError(self.endpoint, self.retry_after(now))
+            self._set_state(HALF_OPEN, now)
+        if self.state == HALF_OPEN:
+            if self.probes >= settings.breaker_half_open_probes:
+                breaker_rejections.inc(self.endpoint)
+                raise CircuitOpenError(self.endpoint, settings.breaker_open_seconds)
+            self.probes += 1
+            return True
+        return False
+
+    def record(self, outcome: Optional[str], probe: bool = False) -> None:
+        # outcome None releases a half-open probe slot without counting the
+        # call, e.g. when the caller was cancelled or the local pool timed out.
+        if not settings.breaker_enabled:
+            return
+        now = time.monotonic()
+        if probe and self.probes:
+            self.probes -= 1
+        if outcome is None:
+            return
+        if self.state == HALF_OPEN:
+            self._set_state(CLOSED if outcome == SUCCESS else OPEN, now)
+            return
+        if self.state == OPEN:
+            return
+
+        self.calls.append((now, outcome))
+        if outcome != SUCCESS:
+            self.failures += 1
+        if outcome == TIMEOUT:
+            self.timeouts += 1
+        self._prune(now)
+        total = len(self.calls)
+        if (
+            total >= settings.breaker_min_requests
+            and self.failures / total >= settings.breaker_error_rate
+        ):
+            self._set_state(OPEN, now)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        self._prune(now)
+        total = len(self.calls)
+        return {
+            "state": self.state,
+            "calls": total,
+            "error_rate": round(self.failures / total, 4) if total else 0.0,
+            "timeout_rate": round(self.timeouts / total, 4) if total else 0.0,
+            "trips": self.trips,
+            "probes_in_flight": self.probes,
+            "retry_after": round(self.retry_after(now), 3) if self.state == OPEN else 0,
+        }
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.breaker_enabled,
+            "window": settings.breaker_window,
+            "min_requests": settings.breaker_min_requests,
+            "error_rate": settings.breaker_error_rate,
+            "open_seconds": settings.breaker_open_seconds,
+            "half_open_probes": settings.breaker_half_open_probes,
+            "endpoints": {
+                endpoint: breaker.stats() for endpoint, breaker in self.breakers.items()
+            },
+        }
+
+
+breakers = BreakerRegistry()
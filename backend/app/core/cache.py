@@ -0,0 +1,499 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Protocol
+
+import httpx
+
+from app.core.config import settings
+from app.core.hedging import hedge_policy
+from app.core.singleflight import upstream_flights
+
+ENTRY_OVERHEAD = 256
+
+# Set inside prefetch tasks: fetches made there are parked for the request
+# that will ask for them instead of being returned to a client.
+prefetching: ContextVar[bool] = ContextVar("prefetching", default=False)
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    status_code: int
+    content: bytes
+    content_type: str
+    url: str
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "CachedResponse":
+        return cls(
+            status_code=response.status_code,
+            content=response.content,
+            content_type=response.headers.get("content-type", ""),
+            url=str(response.request.url),
+        )
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            status_code=self.status_code,
+            content=self.content,
+            headers={"content-type": self.content_type},
+            request=httpx.Request("GET", self.url),
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + len(self.url) + ENTRY_OVERHEAD
+
+
+def session_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def cache_key(session: str, endpoint: str, params: Optional[dict] = None) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return f"{session}:{endpoint}:{query}"
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    def set(self, key: str, session: str, value: CachedResponse, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def delete_session(self, session: str) -> int: ...
+
+    def claim(self, key: str, ttl: float) -> bool: ...
+
+    def release(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, str, CachedResponse]] = (
+            OrderedDict()
+        )
+        self._sessions: dict[str, set[str]] = {}
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, session: str, value: CachedResponse, ttl: float) -> None:
+        if value.size > self.max_bytes:
+            return
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + ttl, session, value)
+        self._sessions.setdefault(session, set()).add(key)
+        self.bytes += value.size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self.delete(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, session, value = entry
+        self.bytes -= value.size
+        keys = self._sessions.get(session)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._sessions[session]
+
+    def delete_session(self, session: str) -> int:
+        keys = self._sessions.pop(session, set())
+        for key in keys:
+            _, _, value = self._entries.pop(key)
+            self.bytes -= value.size
+        return len(keys)
+
+    def claim(self, key: str, ttl: float) -> bool:
+        # Single process: SingleFlight already dedupes concurrent loads.
+        return True
+
+    def release(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sessions.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    session TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    status_code INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_session ON entries (session);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0), ('evictions', 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'bytes';
+END;
+CREATE TABLE IF NOT EXISTS flights (
+    key TEXT PRIMARY KEY,
+    owner INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Hits refresh an entry's LRU position at most this often, so reads from
+# many workers are not each turned into a write.
+TOUCH_INTERVAL = 10.0
+
+
+class SQLiteCacheBackend:
+    # Shared by every worker process on the host through one WAL-mode SQLite
+    # file. Same interface and eviction policy as MemoryCacheBackend (TTL,
+    # byte budget, LRU); claim/release let one worker load a key from the
+    # portal while the others wait for it to appear. Calls block on disk and
+    # on other workers' locks, so ResponseCache runs them off the event loop.
+    blocking = True
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = 0
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # One connection per process; a forked worker must not reuse its
+        # parent's.
+        if self._db is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            # Cached bodies are students' profiles and results: keep the file
+            # private to this user. SQLite gives -wal/-shm the same mode.
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            self._db = sqlite3.connect(
+                self.path, timeout=2.0, isolation_level=None, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SQLITE_SCHEMA)
+            self._pid = os.getpid()
+        return self._db
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        row = self.db.execute(
+            "SELECT expires_at, accessed_at, status_code, content, content_type, url "
+            "FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        expires_at, accessed_at, *value = row
+        if expires_at <= now:
+            self.delete(key)
+            return None
+        if now - accessed_at > TOUCH_INTERVAL:
+            self.db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return CachedResponse(*value)
+
+    def set(self, key: str, session: str, value: CachedResponse, ttl: float) -> None:
+        if value.size > self.max_bytes:
+            return
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    session,
+                    now + ttl,
+                    now,
+                    value.size,
+                    value.status_code,
+                    value.content_type,
+                    value.url,
+                    value.content,
+                ),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self._bytes() <= self.max_bytes:
+            return
+        self.db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        while self._bytes() > self.max_bytes:
+            evicted = self.db.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at LIMIT 1)"
+            ).rowcount
+            if not evicted:
+                break
+            self.db.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'evictions'",
+                (evicted,),
+            )
+
+    def _bytes(self) -> int:
+        return self.db.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+
+    def delete(self, key: str) -> None:
+        self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_session(self, session: str) -> int:
+        return self.db.execute(
+            "DELETE FROM entries WHERE session = ?", (session,)
+        ).rowcount
+
+    def claim(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.execute(
+                "DELETE FROM flights WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            return (
+                self.db.execute(
+                    "INSERT OR IGNORE INTO flights VALUES (?, ?, ?)",
+                    (key, os.getpid(), now + ttl),
+                ).rowcount
+                == 1
+            )
+
+    def release(self, key: str) -> None:
+        self.db.execute(
+            "DELETE FROM flights WHERE key = ? AND owner = ?", (key, os.getpid())
+        )
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        evictions = self.db.execute(
+            "SELECT value FROM meta WHERE name = 'evictions'"
+        ).fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": entries,
+            "bytes": self._bytes(),
+            "max_bytes": self.max_bytes,
+            "evictions": evictions,
+        }
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttls: dict[str, float]):
+        self.backend = backend
+        self.ttls = ttls
+        # Blocking backends get one worker thread: calls stay serialized on the
+        # backend's connection and a locked writer only delays cache calls.
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache")
+            if getattr(backend, "blocking", False)
+            else None
+        )
+        self.hits: dict[str, int] = {endpoint: 0 for endpoint in ttls}
+        self.misses: dict[str, int] = {endpoint: 0 for endpoint in ttls}
+        self.shared_hits = 0
+        # key -> (expires_at, session, upstream task) for prefetched responses
+        self.prefetched: dict[str, tuple[float, str, asyncio.Task]] = {}
+        self.prefetch_claims = 0
+        self.prefetch_expired = 0
+
+    async def fetch(
+        self,
+        endpoint: str,
+        token: str,
+        request: Callable[[], Awaitable[httpx.Response]],
+        params: Optional[dict] = None,
+        refresh: bool = False,
+    ) -> httpx.Response:
+        # refresh skips the cached copy but still stores the new response.
+        ttl = self.ttls.get(endpoint, 0)
+        caching = settings.cache_enabled and ttl > 0
+        session = session_key(token)
+        key = cache_key(session, endpoint, params)
+        prefetch = prefetching.get()
+
+        if not prefetch and not refresh:
+            claimed = self.claim_prefetched(key)
+            if claimed is not None:
+                return await claimed
+
+        if caching and not refresh:
+            cached = await self._call(self.backend.get, key)
+            if cached is not None:
+                if not prefetch:
+                    self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+                return cached.to_response()
+            if not prefetch:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+
+        load = upstream_flights.do(
+            key,
+            lambda: self._load(endpoint, key, session, request, ttl if caching else 0),
+        )
+        if prefetch:
+            return await self.park(key, session, load)
+        return await load
+
+    def park(
+        self, key: str, session: str, load: Awaitable[httpx.Response]
+    ) -> asyncio.Task:
+        now = time.monotonic()
+        for stale in [k for k, entry in self.prefetched.items() if entry[0] <= now]:
+            self.prefetch_expired += 1
+            del self.prefetched[stale]
+        task = asyncio.ensure_future(load)
+        self.prefetched[key] = (now + settings.prefetch_ttl, session, task)
+        return task
+
+    def claim_prefetched(self, key: str) -> Optional[asyncio.Task]:
+        # Each prefetched response is handed out once; later requests go
+        # through the cache as usual.
+        entry = self.prefetched.pop(key, None)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self.prefetch_expired += 1
+            return None
+        self.prefetch_claims += 1
+        return entry[2]
+
+    async def _load(
+        self,
+        endpoint: str,
+        key: str,
+        session: str,
+        request: Callable[[], Awaitable[httpx.Response]],
+        ttl: float,
+    ) -> httpx.Response:
+        if ttl <= 0:
+            return await hedge_policy.fetch(endpoint, request)
+        if not await self._call(
+            self.backend.claim, key, settings.cache_flight_timeout
+        ):
+            # Another worker is loading this key; wait for it to land in the
+            # shared cache before going to the portal ourselves.
+            deadline = time.monotonic() + settings.cache_flight_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                cached = await self._call(self.backend.get, key)
+                if cached is not None:
+                    self.shared_hits += 1
+                    return cached.to_response()
+        try:
+            response = await hedge_policy.fetch(endpoint, request)
+            if response.status_code == 200:
+                await self._call(
+                    self.backend.set,
+                    key,
+                    session,
+                    CachedResponse.from_response(response),
+                    ttl,
+                )
+            return response
+        finally:
+            await self._call(self.backend.release, key)
+
+    async def _call(self, method: Callable, *args):
+        if self._executor is None:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, method, *args
+        )
+
+    async def invalidate(self, token: str) -> int:
+        session = session_key(token)
+        for key in [k for k, entry in self.prefetched.items() if entry[1] == session]:
+            del self.prefetched[key]
+        return await self._call(self.backend.delete_session, session)
+
+    async def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            **(await self._call(self.backend.stats)),
+            "enabled": settings.cache_enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "single_flight": upstream_flights.stats(),
+            "shared_hits": self.shared_hits,
+            "prefetched": {
+                "pending": len(self.prefetched),
+                "claimed": self.prefetch_claims,
+                "expired": self.prefetch_expired,
+            },
+            "endpoints": {
+                endpoint: {
+                    "ttl": ttl,
+                    "hits": self.hits.get(endpoint, 0),
+                    "misses": self.misses.get(endpoint, 0),
+                }
+                for endpoint, ttl in self.ttls.items()
+            },
+        }
+
+
+def cache_backend() -> CacheBackend:
+    if settings.cache_backend == "sqlite":
+        return SQLiteCacheBackend(settings.cache_path, settings.cache_max_bytes)
+    return MemoryCacheBackend(settings.cache_max_bytes)
+
+
+response_cache = ResponseCache(
+    backend=cache_backend(),
+    ttls={
+        "profile": settings.cache_ttl_profile,
+        "result_list": settings.cache_ttl_result_list,
+        "result": settings.cache_ttl_result,
+        "notifications": settings.cache_ttl_notifications,
+    },
+)
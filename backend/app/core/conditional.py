@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+
+from app.core.config import settings
+from app.core.metrics import Counter, registry
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+CODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-msgpack",
+    "text/",
+)
+
+http_not_modified = registry.register(
+    Counter(
+        "uniclare_http_not_modified_total",
+        "API responses answered with 304 Not Modified.",
+    )
+)
+http_compressed_bytes = registry.register(
+    Counter(
+        "uniclare_http_compressed_bytes_total",
+        "Bytes of compressible API responses, by encoding and stage (before, after).",
+        ("encoding", "stage"),
+    )
+)
+
+
+def accepted_encoding(header: str, codings: tuple[str, ...] = CODINGS) -> str | None:
+    # The coding with the highest q-value wins; server order breaks ties.
+    # None when nothing acceptable is offered or the client ranks identity
+    # above every offered coding.
+    accepted = {}
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0)
+    best, best_quality = None, 0.0
+    for coding in codings:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    if best is not None and accepted.get("identity", 0) > best_quality:
+        return None
+    return best
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=settings.brotli_quality)
+    return gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+class ConditionalMiddleware:
+    # Buffers complete /api responses to give them a strong ETag over the
+    # serialized body, answer If-None-Match with 304, and gzip/brotli-encode
+    # bodies above the size threshold. Streaming responses (SSE) and responses
+    # that already set their own ETag or encoding pass through untouched.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        accept_encoding = request_headers.get(b"accept-encoding", b"").decode("latin-1")
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                headers = {name.lower() for name, _ in message.get("headers", [])}
+                if (
+                    message["status"] != 200
+                    or b"etag" in headers
+                    or b"content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            await self.finish(
+                start, message.get("body", b""), if_none_match, accept_encoding, send
+            )
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def finish(self, start, body, if_none_match, accept_encoding, send):
+        headers = [
+            (name, value)
+            for name, value in start.get("headers", [])
+            if name.lower() not in (b"content-length", b"vary")
+        ]
+        vary = [
+            value.decode("latin-1")
+            for name, value in start.get("headers", [])
+            if name.lower() == b"vary"
+        ]
+        content_type = next(
+            (value for name, value in headers if name.lower() == b"content-type"), b""
+        ).decode("latin-1")
+
+        coding = None
+        if len(body) >= settings.compression_min_size and content_type.startswith(
+            COMPRESSIBLE_TYPES
+        ):
+            vary.append("Accept-Encoding")
+            coding = accepted_encoding(accept_encoding)
+
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        # Each encoding of the same body is its own strong entity.
+        etag = f'"{digest}-{coding}"' if coding else f'"{digest}"'
+        headers.append((b"etag", etag.encode()))
+        if vary:
+            headers.append((b"vary", ", ".join(vary).encode()))
+
+        if if_none_match and etag_matches(if_none_match, etag):
+            http_not_modified.inc()
+            await send({**start, "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if coding:
+            encoded = compress(body, coding)
+            http_compressed_bytes.inc(coding, "before", amount=len(body))
+            http_compressed_bytes.inc(coding, "after", amount=len(encoded))
+            body = encoded
+            headers.append((b"content-encoding", coding.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
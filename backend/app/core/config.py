@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,9 +13,99 @@ class Settings(BaseSettings):
 
     webview_host: str = "127.0.0.1"
     webview_port: int = 8080
+    startup_profile: bool = False
 
     # Backend
     cors_origin: str = "*"
+    compression_min_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+
+    # Logging
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_sample_rate: float = 1.0
+    log_queue_size: int = 10000
+
+    # Upstream
+    api_base_url: str = "https://studentportal.universitysolutions.in"
+    result_fanout_limit: int = 4
+    batch_max_operations: int = 16
+    http2: bool = False
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 5.0
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 150.0
+    http_write_timeout: float = 150.0
+    http_pool_timeout: float = 5.0
+
+    # Circuit breaker
+    breaker_enabled: bool = True
+    breaker_window: float = 30.0
+    breaker_min_requests: int = 10
+    breaker_error_rate: float = 0.5
+    breaker_open_seconds: float = 15.0
+    breaker_half_open_probes: int = 2
+
+    # Hedging and retries (idempotent GETs only)
+    hedge_enabled: bool = True
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    hedge_default_delay: float = 2.0
+    hedge_min_delay: float = 0.05
+    hedge_max_delay: float = 10.0
+    retry_max_attempts: int = 3
+    retry_backoff_base: float = 0.1
+    retry_backoff_max: float = 2.0
+    retry_budget_ratio: float = 0.1
+    retry_budget_capacity: float = 10.0
+
+    # Result archive
+    archive_enabled: bool = True
+    archive_path: str = os.path.join(
+        os.path.expanduser("~"), ".uniclare-client", "results.sqlite3"
+    )
+    archive_session_ttl: int = 12 * 3600
+
+    # Result watcher
+    watcher_enabled: bool = False
+    watcher_interval: float = 120.0
+    watcher_max_interval: float = 1800.0
+    watcher_jitter: float = 0.2
+    watcher_concurrency: int = 8
+    watcher_max_failures: int = 8
+    watch_max_sessions: int = 1000
+
+    # Notification stream
+    sse_poll_interval: float = 60.0
+    sse_max_poll_interval: float = 900.0
+    sse_heartbeat: float = 15.0
+    sse_retry: float = 5.0
+    sse_backlog: int = 50
+    sse_max_feeds: int = 1000
+
+    # Post-login prefetch
+    prefetch_enabled: bool = False
+    prefetch_concurrency: int = 8
+    prefetch_ttl: float = 30.0
+
+    # Cache
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_path: str = os.path.join(
+        os.path.expanduser("~"), ".uniclare-client", "cache.sqlite3"
+    )
+    cache_flight_timeout: float = 5.0
+    cache_max_bytes: int = 32 * 1024 * 1024
+    cache_ttl_profile: int = 3600
+    cache_ttl_result_list: int = 300
+    cache_ttl_result: int = 3600
+    cache_ttl_notifications: int = 60
+    export_cache_max_bytes: int = 16 * 1024 * 1024
+    export_cache_ttl: int = 24 * 3600
+    photo_cache_max_bytes: int = 16 * 1024 * 1024
+    photo_sizes: list[int] = [64, 128, 256]
 
 
 settings = Settings()
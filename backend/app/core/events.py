@@ -0,0 +1,77 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass(slots=True)
+class Event:
+    kind: str
+    session: str
+    data: Any = None
+    at: float = field(default_factory=time.time)
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", session: Optional[str], size: int):
+        self.bus = bus
+        self.session = session
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(size)
+        self.dropped = 0
+
+    def put(self, event: Event) -> None:
+        # Slow consumers lose their oldest events rather than blocking the
+        # publisher or growing without bound.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBus:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        # session -> subscriptions; None holds subscribers to every session
+        self._subscribers: dict[Optional[str], set[Subscription]] = {}
+        self.published = 0
+
+    def subscribe(self, session: Optional[str] = None) -> Subscription:
+        subscription = Subscription(self, session, self.queue_size)
+        self._subscribers.setdefault(session, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.session)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.session]
+
+    def publish(self, event: Event) -> None:
+        self.published += 1
+        for subscription in self._subscribers.get(event.session, ()):
+            subscription.put(event)
+        for subscription in self._subscribers.get(None, ()):
+            subscription.put(event)
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+        }
+
+
+event_bus = EventBus()
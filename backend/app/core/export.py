@@ -0,0 +1,465 @@
+import csv
+import hashlib
+import io
+import math
+import zipfile
+import zlib
+from typing import AsyncIterator, Optional
+from xml.sax.saxutils import escape
+
+import orjson
+
+from app.core.cache import CachedResponse, MemoryCacheBackend, session_key
+from app.core.config import settings
+from app.schemas.result import ExamResult
+
+# Bump when the layout of any format changes, so cached exports are rebuilt.
+EXPORT_VERSION = 2
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+COLUMNS = (
+    "exam_no",
+    "sem",
+    "exam_date",
+    "reg_no",
+    "sl_no",
+    "subject",
+    "exam_type",
+    "ese_marks",
+    "viva_marks",
+    "ia_marks",
+    "total_marks",
+    "credits",
+    "grade_points",
+    "credit_points",
+    "grade",
+    "remarks",
+    "sgpa",
+    "cgpa",
+    "percentage",
+    "result",
+)
+
+
+def export_digest(fmt: str, entries: list[dict]) -> str:
+    # The result list carries every exam's revaluation date, so it changes
+    # whenever any exported result can.
+    return hashlib.blake2b(
+        orjson.dumps([fmt, EXPORT_VERSION, entries], option=orjson.OPT_SORT_KEYS),
+        digest_size=16,
+    ).hexdigest()
+
+
+def unavailable(exam: ExamResult) -> str:
+    return f"Unavailable (HTTP {exam.status_code})"
+
+
+def exam_rows(exam: ExamResult) -> list[list[Optional[str]]]:
+    data = exam.data
+    if data is None:
+        # Keep a failed exam visible instead of leaving a silent gap.
+        row = [exam.exam_no, None, None, exam.reg_no] + [None] * (len(COLUMNS) - 4)
+        row[-1] = unavailable(exam)
+        return [row]
+    details, info = data.student_details, data.result
+    return [
+        [
+            exam.exam_no,
+            details.sem,
+            details.exam_date,
+            exam.reg_no,
+            None if subject.id is None else str(subject.id),
+            subject.sub,
+            subject.exam_type,
+            subject.ese_marks,
+            subject.viva_marks,
+            subject.ia_marks,
+            subject.total_marks,
+            subject.credits,
+            subject.grade_points,
+            subject.credit_points,
+            subject.grade,
+            subject.remarks,
+            info.sgpa,
+            info.cgpa,
+            info.percentage,
+            info.result,
+        ]
+        for subject in data.subjects
+    ]
+
+
+async def csv_export(results: AsyncIterator[ExamResult]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    async for exam in results:
+        writer.writerows(exam_rows(exam))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class Pipe(io.RawIOBase):
+    # Write-only, unseekable sink: zipfile then writes data descriptors and
+    # the archive can be drained chunk by chunk as it is produced.
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Results" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+COLUMN_LETTERS = [chr(ord("A") + i) for i in range(len(COLUMNS))]
+
+
+def numeric(value: str) -> bool:
+    # Codes with leading zeros stay text so they survive the round trip.
+    if value.startswith("0") and value[1:2].isdigit():
+        return False
+    try:
+        return math.isfinite(float(value))
+    except ValueError:
+        return False
+
+
+def xlsx_row(number: int, values) -> str:
+    cells = []
+    for letter, value in zip(COLUMN_LETTERS, values):
+        if value is None or value == "":
+            continue
+        ref = f"{letter}{number}"
+        if numeric(value):
+            cells.append(f'<c r="{ref}"><v>{value.strip()}</v></c>')
+        else:
+            cells.append(
+                f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+            )
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+async def xlsx_export(results: AsyncIterator[ExamResult]) -> AsyncIterator[bytes]:
+    # A minimal SpreadsheetML workbook with one sheet of inline strings, so
+    # no shared-strings table has to be built before the rows are written.
+    pipe = Pipe()
+    with zipfile.ZipFile(pipe, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            sheet.write(xlsx_row(1, COLUMNS).encode())
+            number = 1
+            async for exam in results:
+                for row in exam_rows(exam):
+                    number += 1
+                    sheet.write(xlsx_row(number, row).encode())
+                yield pipe.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield pipe.drain()
+
+
+# A4 landscape, in points.
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595
+MARGIN = 40
+LINE = 14
+# (heading, x position, max characters) per marksheet column.
+PDF_COLUMNS = (
+    ("Subject", MARGIN, 46),
+    ("ESE", 330, 6),
+    ("Viva", 375, 6),
+    ("IA", 420, 6),
+    ("Total", 465, 6),
+    ("Credits", 515, 7),
+    ("GP", 570, 6),
+    ("CP", 615, 6),
+    ("Grade", 660, 6),
+    ("Remarks", 710, 14),
+)
+
+
+def pdf_text(value: Optional[str], limit: int = 120) -> bytes:
+    # Standard Helvetica only covers Latin-1; anything else is replaced.
+    text = (value or "-")[:limit]
+    text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return text.encode("latin-1", "replace")
+
+
+class PdfWriter:
+    # Writes PDF objects in order and remembers their offsets for the xref
+    # table. Object 1 is the catalog, 2 the page tree and 3 the font; the page
+    # tree is written last, once every page is known.
+    def __init__(self):
+        self.offset = 0
+        self.offsets: dict[int, int] = {}
+        self.pages: list[int] = []
+        self.next_id = 4
+
+    def emit(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+
+    def obj(self, number: int, body: bytes) -> bytes:
+        self.offsets[number] = self.offset
+        return self.emit(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def start(self) -> bytes:
+        return self.emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n") + self.obj(
+            3,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>",
+        )
+
+    def page(self, operations: bytes) -> bytes:
+        content, page = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self.pages.append(page)
+        stream = zlib.compress(operations)
+        return self.obj(
+            content,
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(stream), stream),
+        ) + self.obj(
+            page,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content),
+        )
+
+    def finish(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % page for page in self.pages)
+        data = self.obj(
+            2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.pages))
+        ) + self.obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.offset
+        count = self.next_id
+        table = [b"xref\n0 %d\n0000000000 65535 f \n" % count]
+        table += [b"%010d 00000 n \n" % self.offsets[n] for n in range(1, count)]
+        table.append(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (count, xref)
+        )
+        return data + self.emit(b"".join(table))
+
+
+class MarksheetLayout:
+    # Flows exams down the page, starting a new page when the next line would
+    # cross the bottom margin.
+    def __init__(self, writer: PdfWriter):
+        self.writer = writer
+        self.operations: list[bytes] = []
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def text(self, x: int, value: Optional[str], size: int = 9, limit: int = 120):
+        self.operations.append(
+            b"BT /F1 %d Tf %d %d Td (%s) Tj ET\n" % (size, x, self.y, pdf_text(value, limit))
+        )
+
+    def line(self, needed: int = 1) -> bytes:
+        # Moves down one line; returns a finished page if it had to break.
+        page = b""
+        if self.y - LINE * needed < MARGIN:
+            page = self.flush()
+        self.y -= LINE
+        return page
+
+    def flush(self) -> bytes:
+        page = b""
+        if self.operations:
+            page = self.writer.page(b"".join(self.operations))
+        self.operations = []
+        self.y = PAGE_HEIGHT - MARGIN
+        return page
+
+    def exam(self, exam: ExamResult) -> bytes:
+        data = exam.data
+        if data is None:
+            out = self.line(needed=2)
+            self.text(
+                MARGIN,
+                f"{exam.exam_no or '-'}  -  Reg. No. {exam.reg_no or '-'}",
+                size=12,
+            )
+            out += self.line()
+            self.text(MARGIN, unavailable(exam), size=10)
+            out += self.line()
+            return out
+        details, info = data.student_details, data.result
+        # Keep the heading with at least the first few subjects.
+        out = self.line(needed=5)
+        self.text(
+            MARGIN,
+            f"{details.sem or exam.exam_no}  -  {details.exam_date or ''}"
+            f"  -  Reg. No. {exam.reg_no or '-'}",
+            size=12,
+        )
+        out += self.line()
+        for heading, x, _ in PDF_COLUMNS:
+            self.text(x, heading, size=9)
+        for subject in data.subjects:
+            out += self.line()
+            values = (
+                subject.sub,
+                subject.ese_marks,
+                subject.viva_marks,
+                subject.ia_marks,
+                subject.total_marks,
+                subject.credits,
+                subject.grade_points,
+                subject.credit_points,
+                subject.grade,
+                subject.remarks,
+            )
+            for (_, x, limit), value in zip(PDF_COLUMNS, values):
+                self.text(x, value, limit=limit)
+        out += self.line()
+        self.text(
+            MARGIN,
+            f"SGPA {info.sgpa or '-'}    CGPA {info.cgpa or '-'}    "
+            f"Percentage {info.percentage or '-'}    Result {info.result or '-'}",
+            size=10,
+        )
+        out += self.line()
+        return out
+
+
+async def pdf_export(results: AsyncIterator[ExamResult]) -> AsyncIterator[bytes]:
+    writer = PdfWriter()
+    layout = MarksheetLayout(writer)
+    yield writer.start()
+    async for exam in results:
+        chunk = layout.exam(exam)
+        if chunk:
+            yield chunk
+    yield layout.flush() + writer.finish()
+
+
+EXPORTERS = {"csv": csv_export, "xlsx": xlsx_export, "pdf": pdf_export}
+
+
+async def first_available(
+    results: AsyncIterator[ExamResult],
+) -> Optional[AsyncIterator[ExamResult]]:
+    # Waits for the first exam that loaded before anything is sent, so an
+    # export in which every exam failed can still be answered with an error.
+    # Returns None in that case, else the full stream.
+    head: list[ExamResult] = []
+    async for exam in results:
+        head.append(exam)
+        if exam.data is not None:
+            break
+    else:
+        return None
+
+    async def chained() -> AsyncIterator[ExamResult]:
+        for exam in head:
+            yield exam
+        async for exam in results:
+            yield exam
+
+    return chained()
+
+
+class ExportCache:
+    # Finished exports, keyed by export_digest. Chunks are teed into the cache
+    # while they stream to the client; exports with failed exams (written out
+    # with an "Unavailable" marker), or larger than the cache, are not kept.
+    def __init__(self, max_bytes: int):
+        self.backend = MemoryCacheBackend(max_bytes)
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+        return cached
+
+    async def build(
+        self, key: str, token: str, fmt: str, results: AsyncIterator[ExamResult]
+    ) -> AsyncIterator[bytes]:
+        failed = False
+
+        async def checked() -> AsyncIterator[ExamResult]:
+            nonlocal failed
+            async for exam in results:
+                failed = failed or exam.data is None
+                yield exam
+
+        chunks: Optional[list[bytes]] = []
+        size = 0
+        async for chunk in EXPORTERS[fmt](checked()):
+            if chunks is not None:
+                size += len(chunk)
+                if size <= self.backend.max_bytes:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+            yield chunk
+        self.builds += 1
+        if chunks is not None and not failed:
+            self.backend.set(
+                key,
+                session_key(token),
+                CachedResponse(200, b"".join(chunks), MEDIA_TYPES[fmt], key),
+                settings.export_cache_ttl,
+            )
+
+    def invalidate(self, token: str) -> None:
+        self.backend.delete_session(session_key(token))
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "hits": self.hits, "builds": self.builds}
+
+
+export_cache = ExportCache(settings.export_cache_max_bytes)
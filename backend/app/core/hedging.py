@@ -0,0 +1,156 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import Counter, registry
+
+upstream_hedges = registry.register(
+    Counter(
+        "uniclare_upstream_hedges_total",
+        "Hedged portal requests, by endpoint and outcome (fired, won, lost).",
+        ("endpoint", "outcome"),
+    )
+)
+upstream_retries = registry.register(
+    Counter(
+        "uniclare_upstream_retries_total",
+        "Portal requests retried after a connect error, by endpoint.",
+        ("endpoint",),
+    )
+)
+retry_budget_exhausted = registry.register(
+    Counter(
+        "uniclare_retry_budget_exhausted_total",
+        "Hedges or retries skipped because the retry budget was empty, by endpoint.",
+        ("endpoint",),
+    )
+)
+
+SAMPLE_SIZE = 256
+
+
+class RetryBudget:
+    # Every first attempt deposits `ratio` tokens and every hedge or retry
+    # spends one, so extra load stays a bounded fraction of real traffic even
+    # when the portal is down.
+    def __init__(self, ratio: float, capacity: float):
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class HedgePolicy:
+    def __init__(self):
+        self.budget = RetryBudget(
+            settings.retry_budget_ratio, settings.retry_budget_capacity
+        )
+        self.samples: dict[str, deque[float]] = {}
+
+    def delay(self, endpoint: str) -> float:
+        samples = self.samples.get(endpoint)
+        if not samples or len(samples) < settings.hedge_min_samples:
+            return settings.hedge_default_delay
+        ordered = sorted(samples)
+        value = ordered[min(len(ordered) - 1, int(len(ordered) * settings.hedge_quantile))]
+        return min(max(value, settings.hedge_min_delay), settings.hedge_max_delay)
+
+    def observe(self, endpoint: str, elapsed: float) -> None:
+        samples = self.samples.get(endpoint)
+        if samples is None:
+            samples = self.samples[endpoint] = deque(maxlen=SAMPLE_SIZE)
+        samples.append(elapsed)
+
+    async def fetch(
+        self, endpoint: str, request: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        # Only for idempotent GETs: a slow first attempt is raced against a
+        # second one fired after the endpoint's p95 latency.
+        self.budget.deposit()
+        if not settings.hedge_enabled:
+            return await self._attempt(endpoint, request)
+
+        primary = asyncio.ensure_future(self._attempt(endpoint, request))
+        done, _ = await asyncio.wait({primary}, timeout=self.delay(endpoint))
+        if done:
+            return primary.result()
+        if not self.budget.withdraw():
+            retry_budget_exhausted.inc(endpoint)
+            return await primary
+
+        upstream_hedges.inc(endpoint, "fired")
+        hedge = asyncio.ensure_future(self._attempt(endpoint, request))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None or not pending:
+                        won = task is hedge and task.exception() is None
+                        upstream_hedges.inc(endpoint, "won" if won else "lost")
+                        return task.result()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
+    async def _attempt(
+        self, endpoint: str, request: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            start_time = time.perf_counter()
+            try:
+                response = await request()
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                attempt += 1
+                if attempt >= settings.retry_max_attempts:
+                    raise
+                if not self.budget.withdraw():
+                    retry_budget_exhausted.inc(endpoint)
+                    raise
+                upstream_retries.inc(endpoint)
+                # Full jitter: sleep anywhere up to the exponential backoff.
+                backoff = min(
+                    settings.retry_backoff_max,
+                    settings.retry_backoff_base * 2 ** (attempt - 1),
+                )
+                await asyncio.sleep(random.uniform(0, backoff))
+                continue
+            self.observe(endpoint, time.perf_counter() - start_time)
+            return response
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.hedge_enabled,
+            "budget_tokens": round(self.budget.tokens, 3),
+            "endpoints": {
+                endpoint: {
+                    "delay": round(self.delay(endpoint), 4),
+                    "samples": len(samples),
+                    "fired": upstream_hedges.get(endpoint, "fired"),
+                    "won": upstream_hedges.get(endpoint, "won"),
+                    "retries": upstream_retries.get(endpoint),
+                    "budget_exhausted": retry_budget_exhausted.get(endpoint),
+                }
+                for endpoint, samples in self.samples.items()
+            },
+        }
+
+
+hedge_policy = HedgePolicy()
@@ -1,10 +1,21 @@
 import http.cookiejar
+import time
 from typing import Annotated
 
 import httpx
 from fastapi import Depends
 from fastapi.security import HTTPBearer
 
+from app.core.breaker import FAILURE, SUCCESS, TIMEOUT, breakers
+from app.core.logs import record_upstream
+from app.core.metrics import (
+    upstream_errors,
+    upstream_in_flight,
+    upstream_latency,
+    upstream_requests,
+)
+from app.core.urls import upstream_endpoint
+
 security = HTTPBearer()
 
 
@@ -16,8 +27,79 @@ class NullCookieJar(http.cookiejar.CookieJar):
         pass
 
 
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limits: httpx.Limits = kwargs.get("limits", httpx.Limits())
+        self.in_flight = 0
+        self.requests = 0
+        self.pool_timeouts = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = upstream_endpoint(
+            f"{request.url.scheme}://{request.url.netloc.decode()}{request.url.path}",
+            request.url.params.get("a"),
+        )
+        breaker = breakers.get(endpoint)
+        probe = breaker.before()
+        outcome = None
+        self.in_flight += 1
+        self.requests += 1
+        upstream_in_flight.inc(endpoint)
+        start_time = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+            upstream_requests.inc(endpoint, str(response.status_code))
+            if response.status_code >= 500:
+                upstream_errors.inc(endpoint, "5xx")
+                outcome = FAILURE
+            else:
+                outcome = SUCCESS
+            return response
+        except httpx.TimeoutException as exc:
+            if isinstance(exc, httpx.PoolTimeout):
+                self.pool_timeouts += 1
+            else:
+                outcome = TIMEOUT
+            upstream_errors.inc(endpoint, "timeout")
+            raise
+        except httpx.NetworkError:
+            upstream_errors.inc(endpoint, "network")
+            outcome = FAILURE
+            raise
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.in_flight -= 1
+            upstream_in_flight.dec(endpoint)
+            upstream_latency.observe(elapsed, endpoint)
+            record_upstream(elapsed)
+            breaker.record(outcome, probe)
+
+    def stats(self) -> dict:
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        waiting = sum(
+            1
+            for pool_request in getattr(self._pool, "_requests", [])
+            if pool_request.is_queued()
+        )
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "waiting": waiting,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+
 class HTTPClientState:
     client: httpx.AsyncClient | None = None
+    transport: InstrumentedTransport | None = None
 
 
 http_state = HTTPClientState()
@@ -0,0 +1,196 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import uuid
+import zlib
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger("uniclare")
+
+RECORD_FIELDS = (
+    "request_id",
+    "method",
+    "path",
+    "route",
+    "status",
+    "outcome",
+    "elapsed_ms",
+    "upstream_ms",
+    "upstream_calls",
+)
+
+
+@dataclass(slots=True)
+class RequestContext:
+    request_id: str
+    upstream_ms: float = 0.0
+    upstream_calls: int = 0
+    sampled: bool = True
+
+
+_request: ContextVar[Optional[RequestContext]] = ContextVar("request", default=None)
+
+
+def record_upstream(elapsed: float) -> None:
+    context = _request.get()
+    if context is not None:
+        context.upstream_ms += elapsed * 1000
+        context.upstream_calls += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in RECORD_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        return orjson.dumps(entry).decode()
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(
+            f"{name}={getattr(record, name)}"
+            for name in RECORD_FIELDS
+            if getattr(record, name, None) is not None
+        )
+        return f"[{record.levelname.lower()}] {record.getMessage()} {fields}".rstrip()
+
+
+class SamplingFilter(logging.Filter):
+    # Warnings and errors always pass; below that, a request's records are kept
+    # or dropped together based on its sampling decision.
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        context = _request.get()
+        return context is None or context.sampled
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    def __init__(self):
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        if self.listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(
+            JsonFormatter() if settings.log_format == "json" else TextFormatter()
+        )
+        self.handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size))
+        self.handler.addFilter(SamplingFilter())
+        self.listener = logging.handlers.QueueListener(
+            self.handler.queue, output, respect_handler_level=False
+        )
+        logger.addHandler(self.handler)
+        logger.setLevel(settings.log_level.upper())
+        logger.propagate = False
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is None:
+            return
+        self.listener.stop()
+        logger.removeHandler(self.handler)
+        self.listener = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queue.qsize() if self.handler else 0,
+            "dropped": self.handler.dropped if self.handler else 0,
+        }
+
+
+log_pipeline = LogPipeline()
+
+
+def _sampled(request_id: str) -> bool:
+    rate = settings.log_sample_rate
+    if rate >= 1:
+        return True
+    return zlib.crc32(request_id.encode()) / 0xFFFFFFFF < rate
+
+
+class RequestLogMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        context = RequestContext(request_id=request_id or uuid.uuid4().hex)
+        context.sampled = _sampled(context.request_id)
+        token = _request.set(context)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", context.request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500:
+                level, outcome = logging.ERROR, "error"
+            elif status_code >= 400:
+                level, outcome = logging.INFO, "rejected"
+            else:
+                level, outcome = logging.INFO, "ok"
+            logger.log(
+                level,
+                "request",
+                extra={
+                    "request_id": context.request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(scope.get("route"), "name", None),
+                    "status": status_code,
+                    "outcome": outcome,
+                    "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 3),
+                    "upstream_ms": round(context.upstream_ms, 3),
+                    "upstream_calls": context.upstream_calls,
+                },
+            )
+            _request.reset(token)
@@ -0,0 +1,81 @@
+from typing import Any, Callable, Generic, Iterable, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _get_path(data: Any, path: tuple) -> Any:
+    for step in path:
+        if data is None:
+            return None
+        if isinstance(step, int):
+            data = data[step] if isinstance(data, list) and len(data) > step else None
+        else:
+            data = data.get(step) if isinstance(data, dict) else None
+    return data
+
+
+class One:
+    def __init__(self, field_map: "FieldMap", *path: Union[str, int]):
+        self.field_map = field_map
+        self.path = path
+
+
+class Many:
+    def __init__(self, field_map: "FieldMap", *path: Union[str, int]):
+        self.field_map = field_map
+        self.path = path
+
+
+Source = Union[str, tuple, One, Many]
+
+
+class FieldMap(Generic[M]):
+    def __init__(self, model: Type[M], fields: dict[str, Source]):
+        self.model = model
+        self.fields = fields
+        self.extract = self._compile(fields)
+
+    def _compile(self, fields: dict[str, Source]):
+        # Resolves every source to a getter once, so mapping a body is one
+        # dict comprehension over (name, getter) pairs with no per-field
+        # dispatch at request time.
+        getters = [
+            (name, self._getter(name, source)) for name, source in fields.items()
+        ]
+
+        def extract(d: dict) -> dict:
+            return {name: get(d) for name, get in getters}
+
+        return extract
+
+    @staticmethod
+    def _getter(name: str, source: Source) -> Callable[[dict], Any]:
+        if isinstance(source, str):
+            return lambda d: d.get(source)
+        if isinstance(source, tuple):
+            return lambda d: _get_path(d, source)
+        if isinstance(source, One):
+            extract, path = source.field_map.extract, source.path
+
+            def one(d: dict) -> dict:
+                value = _get_path(d, path)
+                return extract(value) if value is not None else {}
+
+            return one
+        if isinstance(source, Many):
+            extract, path = source.field_map.extract, source.path
+            return lambda d: [extract(value) for value in _get_path(d, path) or ()]
+        raise TypeError(f"Unsupported source for {name!r}: {source!r}")
+
+    def map(self, data: Optional[dict], **extra: Any) -> M:
+        values = self.extract(data or {})
+        if extra:
+            values.update(extra)
+        return self.model.model_validate(values)
+
+    def map_many(self, items: Optional[Iterable[dict]]) -> list[M]:
+        validate = self.model.model_validate
+        extract = self.extract
+        return [validate(extract(item)) for item in items or ()]
@@ -0,0 +1,170 @@
+import asyncio
+import base64
+import hashlib
+import importlib.util
+import io
+import secrets
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from app.core.cache import CachedResponse, MemoryCacheBackend, session_key
+from app.core.config import settings
+from app.core.constants import authenticated_headers
+from app.core.logs import logger
+from app.core.urls import API_BASE_URL
+
+# Resizing is optional; originals are served without it. Pillow is only
+# imported on the first resize, so it stays off the startup path.
+RESIZING = importlib.util.find_spec("PIL") is not None
+
+PHOTO_TTL = 24 * 3600
+# Only photos on the portal's own host are fetched with the session cookie.
+PORTAL_HOST = httpx.URL(API_BASE_URL).host
+
+
+def decode_data_uri(source: str) -> Optional[tuple[bytes, str]]:
+    header, _, payload = source.partition(",")
+    if not header.startswith("data:") or not header.endswith(";base64"):
+        return None
+    try:
+        return base64.b64decode(payload), header[5:-7] or "application/octet-stream"
+    except ValueError:
+        return None
+
+
+def resize(content: bytes, size: int) -> Optional[tuple[bytes, str]]:
+    if not RESIZING:
+        return None
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image.thumbnail((size, size))
+            output = io.BytesIO()
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(output, format="JPEG", quality=85, optimize=True)
+    except (OSError, ValueError):
+        return None
+    return output.getvalue(), "image/jpeg"
+
+
+class PhotoStore:
+    # Profile responses carry a link to /api/user/photo/{id} instead of the
+    # photo itself. Ids are keyed hashes of the portal's photo value, so they
+    # cannot be guessed and <img> tags can load them without a bearer token.
+    # The original is loaded at registration, while the session's token is at
+    # hand: data URIs are decoded straight into the byte-bounded cache and
+    # portal URLs are fetched in the background. Afterwards only id -> session
+    # is kept, so neither tokens nor photo data outlive the load; an evicted
+    # photo is reloaded the next time the profile is served.
+    def __init__(self, max_bytes: int, max_sources: int = 10000):
+        self.cache = MemoryCacheBackend(max_bytes)
+        self.max_sources = max_sources
+        self.secret = secrets.token_bytes(32)
+        self.sources: OrderedDict[str, str] = OrderedDict()
+        self.loading: dict[str, asyncio.Task] = {}
+        self.fetches = 0
+
+    def register(
+        self, token: str, source: Optional[str], client: httpx.AsyncClient
+    ) -> Optional[str]:
+        if not source:
+            return None
+        photo_id = hashlib.blake2b(
+            source.encode(), key=self.secret, digest_size=16
+        ).hexdigest()
+        session = session_key(token)
+        if self.cache.get(f"{photo_id}:0") is None and photo_id not in self.loading:
+            decoded = decode_data_uri(source)
+            if decoded is not None:
+                self.fetches += 1
+                self.cache.set(
+                    f"{photo_id}:0",
+                    session,
+                    CachedResponse(200, decoded[0], decoded[1], photo_id),
+                    PHOTO_TTL,
+                )
+            elif source.startswith(("http://", "https://")):
+                task = asyncio.create_task(self._fetch(photo_id, source, token, client))
+                self.loading[photo_id] = task
+                task.add_done_callback(lambda _: self.loading.pop(photo_id, None))
+            else:
+                # Nothing to proxy (e.g. a bare file name): pass it through.
+                return source
+        self.sources[photo_id] = session
+        self.sources.move_to_end(photo_id)
+        while len(self.sources) > self.max_sources:
+            self.sources.popitem(last=False)
+        return f"/api/user/photo/{photo_id}"
+
+    async def get(self, photo_id: str, size: Optional[int]) -> Optional[CachedResponse]:
+        session = self.sources.get(photo_id)
+        if session is None:
+            return None
+        key = f"{photo_id}:{size or 0}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        loading = self.loading.get(photo_id)
+        if loading is not None:
+            await asyncio.shield(loading)
+        original = self.cache.get(f"{photo_id}:0")
+        if original is None or not size:
+            return original
+
+        # Decoding and re-encoding is CPU work; keep it off the event loop.
+        resized = await asyncio.to_thread(resize, original.content, size)
+        if resized is None:
+            return original
+        variant = CachedResponse(200, resized[0], resized[1], original.url)
+        self.cache.set(key, session, variant, PHOTO_TTL)
+        return variant
+
+    async def _fetch(
+        self, photo_id: str, source: str, token: str, client: httpx.AsyncClient
+    ) -> None:
+        self.fetches += 1
+        try:
+            if httpx.URL(source).host == PORTAL_HOST:
+                # No redirects: they would carry the session cookie off-host.
+                response = await client.get(
+                    source, headers=authenticated_headers(token), follow_redirects=False
+                )
+            else:
+                response = await client.get(source)
+        except httpx.HTTPError as exc:
+            logger.warning("photo fetch failed: %s: %s", type(exc).__name__, exc)
+            return
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or not content_type.startswith("image/"):
+            return
+        self.cache.set(
+            f"{photo_id}:0",
+            session_key(token),
+            CachedResponse(200, response.content, content_type, photo_id),
+            PHOTO_TTL,
+        )
+
+    def invalidate(self, token: str) -> None:
+        session = session_key(token)
+        self.cache.delete_session(session)
+        for photo_id in [i for i, owner in self.sources.items() if owner == session]:
+            del self.sources[photo_id]
+            if photo_id in self.loading:
+                self.loading[photo_id].cancel()
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "sources": len(self.sources),
+            "loading": len(self.loading),
+            "fetches": self.fetches,
+            "resizing": RESIZING,
+        }
+
+
+photo_store = PhotoStore(settings.photo_cache_max_bytes)
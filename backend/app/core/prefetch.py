@@ -0,0 +1,91 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.archive import result_archive
+from app.core.cache import prefetching
+from app.core.config import settings
+from app.core.logs import logger
+from app.services.notifications import notification
+from app.services.result import result, result_list
+from app.services.user import profile
+
+
+class Prefetcher:
+    # Right after login the dashboard asks for the profile, the result list,
+    # notifications and, usually, the newest result. With prefetch enabled
+    # those portal calls start as soon as login succeeds; the responses are
+    # parked in response_cache for the requests that follow to claim. One
+    # semaphore bounds prefetch traffic across all sessions.
+    def __init__(self):
+        self.limiter = asyncio.Semaphore(max(settings.prefetch_concurrency, 1))
+        self._tasks: set[asyncio.Task] = set()
+        self.started = 0
+        self.fetched = 0
+        self.failed = 0
+
+    def start(self, token: str, client: httpx.AsyncClient) -> None:
+        if not settings.prefetch_enabled:
+            return
+        self.started += 1
+        task = asyncio.create_task(self._run(token, client))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, token: str, client: httpx.AsyncClient) -> None:
+        prefetching.set(True)
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        await asyncio.gather(
+            self._fetch(lambda: profile(credentials, client)),
+            self._fetch(lambda: notification(credentials, client)),
+            self._newest_result(credentials, client),
+        )
+
+    async def _newest_result(
+        self, token: HTTPAuthorizationCredentials, client: httpx.AsyncClient
+    ) -> None:
+        response = await self._fetch(lambda: result_list(token, client))
+        if response is None or response.status_code != 200:
+            return
+        entries = response.json().get("data") or []
+        if not entries:
+            return
+        # The portal lists the newest exam first; archived ones are served
+        # without a portal call anyway.
+        exam_no, reg_no = entries[0].get("year"), entries[0].get("regno")
+        if exam_no in await result_archive.revisions(reg_no):
+            return
+        await self._fetch(lambda: result(exam_no, reg_no, token, client))
+
+    async def _fetch(
+        self, call: Callable[[], Awaitable[httpx.Response]]
+    ) -> Optional[httpx.Response]:
+        async with self.limiter:
+            try:
+                response = await call()
+            except Exception as exc:
+                self.failed += 1
+                logger.warning("prefetch failed: %s: %s", type(exc).__name__, exc)
+                return None
+        self.fetched += 1
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.prefetch_enabled,
+            "concurrency": settings.prefetch_concurrency,
+            "running": len(self._tasks),
+            "started": self.started,
+            "fetched": self.fetched,
+            "failed": self.failed,
+        }
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,103 @@
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Callable
+
+import msgpack
+import orjson
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+DEFAULT_MEDIA_TYPE = "application/json"
+
+_accept: ContextVar[str] = ContextVar("accept", default="")
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    "application/json": lambda content: orjson.dumps(content, default=_plain),
+    "application/msgpack": lambda content: msgpack.packb(content, default=_plain),
+    "application/x-msgpack": lambda content: msgpack.packb(content, default=_plain),
+}
+
+
+def register_encoder(media_type: str, encoder: Callable[[Any], bytes]) -> None:
+    ENCODERS[media_type] = encoder
+
+
+@functools.lru_cache(maxsize=128)
+def negotiate(accept: str) -> str:
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.strip().lower()))
+    for _, _, media_type in sorted(candidates):
+        if media_type in ENCODERS:
+            return media_type
+    return DEFAULT_MEDIA_TYPE
+
+
+class EncodedResponse(Response):
+    media_type = DEFAULT_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        self.media_type = negotiate(_accept.get())
+        return ENCODERS[self.media_type](content)
+
+
+class EncodedRoute(APIRoute):
+    # Endpoint return values are encoded straight from the Pydantic models by
+    # EncodedResponse instead of going through jsonable_encoder + json.dumps,
+    # in whichever format the request's Accept header asks for.
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if inspect.iscoroutinefunction(endpoint) and not getattr(
+            endpoint, "encoded", False
+        ):
+            endpoint = self.encoded_endpoint(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def encoded_endpoint(endpoint: Callable[..., Any], status_code: int):
+        @functools.wraps(endpoint)
+        async def encoded_endpoint(*args: Any, **values: Any) -> Any:
+            content = await endpoint(*args, **values)
+            if isinstance(content, Response):
+                return content
+            if not is_body_allowed_for_status_code(status_code):
+                return Response(status_code=status_code)
+            return EncodedResponse(content, status_code=status_code)
+
+        encoded_endpoint.encoded = True
+        return encoded_endpoint
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            token = _accept.set(request.headers.get("accept", ""))
+            try:
+                response = await handler(request)
+            finally:
+                _accept.reset(token)
+            if isinstance(response, EncodedResponse):
+                response.headers["vary"] = "Accept"
+            return response
+
+        return negotiated_handler
@@ -0,0 +1,18 @@
+import threading
+
+import uvicorn
+
+
+class ReadyServer(uvicorn.Server):
+    # uvicorn.Server that signals in-process once startup is over, so the
+    # desktop shell can navigate without polling the port. `ready` is set on
+    # failure too (lifespan error, port in use); check `started` to tell.
+    def __init__(self, config: uvicorn.Config, ready: threading.Event | None = None):
+        super().__init__(config)
+        self.ready = ready or threading.Event()
+
+    async def startup(self, sockets=None) -> None:
+        try:
+            await super().startup(sockets=sockets)
+        finally:
+            self.ready.set()
@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.core.conditional import accepted_encoding, etag_matches
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Vite emits fingerprinted bundles as assets/<name>-<hash>.<ext>
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+SIBLINGS = {"br": ".br", "gzip": ".gz"}
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    # Serves the .br/.gz siblings written at build time when the client accepts
+    # them, and marks fingerprinted bundles as immutable.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._siblings: dict[str, dict[str, tuple[str, os.stat_result]]] = {}
+
+    def siblings(self, full_path: str) -> dict[str, tuple[str, os.stat_result]]:
+        found = self._siblings.get(full_path)
+        if found is None:
+            found = {}
+            for coding, suffix in SIBLINGS.items():
+                try:
+                    found[coding] = (full_path + suffix, os.stat(full_path + suffix))
+                except OSError:
+                    pass
+            self._siblings[full_path] = found
+        return found
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        request_headers = Headers(scope=scope)
+        path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        headers = {
+            "Cache-Control": IMMUTABLE if HASHED_ASSET.match(path) else REVALIDATE
+        }
+        siblings = self.siblings(str(full_path))
+        if siblings:
+            headers["Vary"] = "Accept-Encoding"
+            coding = accepted_encoding(
+                request_headers.get("accept-encoding", ""), tuple(siblings)
+            )
+            if coding is not None:
+                headers["Content-Encoding"] = coding
+                media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+                full_path, stat_result = siblings[coding]
+                response = FileResponse(
+                    full_path,
+                    status_code=status_code,
+                    stat_result=stat_result,
+                    media_type=media_type,
+                    headers=headers,
+                )
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SpaIndex:
+    # index.html is read once; every client-side route is answered from memory
+    # in whichever encoding the client takes, with an ETag for revalidation.
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.variants: dict[Optional[str], tuple[bytes, str]] = {
+            None: (content, f'"{digest}"')
+        }
+        for coding, suffix in SIBLINGS.items():
+            if os.path.isfile(path + suffix):
+                with open(path + suffix, "rb") as f:
+                    encoded = f.read()
+            elif coding == "gzip":
+                encoded = gzip.compress(content, compresslevel=9, mtime=0)
+            elif brotli is not None:
+                encoded = brotli.compress(content, quality=11)
+            else:
+                continue
+            self.variants[coding] = (encoded, f'"{digest}-{coding}"')
+
+    def response(self, accept_encoding: str, if_none_match: Optional[str]) -> Response:
+        coding = accepted_encoding(accept_encoding, tuple(c for c in self.variants if c))
+        body, etag = self.variants[coding]
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE, "Vary": "Accept-Encoding"}
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        if coding is not None:
+            headers["Content-Encoding"] = coding
+        return Response(body, media_type="text/html", headers=headers)
@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import random
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Optional
+
+import httpx
+import orjson
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.cache import session_key
+from app.core.config import settings
+from app.core.events import Event, event_bus
+from app.core.logs import logger
+from app.schemas.notification import NOTIFICATION_MAP, NotificationResponse
+from app.services.notifications import notification
+
+
+def notification_hash(item: NotificationResponse) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(item.model_dump(), option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+def sse(event: str, data: bytes, event_id: Optional[int] = None) -> bytes:
+    lines = [f"event: {event}".encode()]
+    if event_id is not None:
+        lines.append(f"id: {event_id}".encode())
+    lines.append(b"data: " + data)
+    return b"\n".join(lines) + b"\n\n"
+
+
+class SessionFeed:
+    def __init__(self, token: str):
+        self.token = token
+        self.session = session_key(token)
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self.seen: Optional[set[str]] = None
+        self.last_id = 0
+        self.backlog: deque[tuple[int, bytes]] = deque(maxlen=settings.sse_backlog)
+        self.failures = 0
+
+    def replay(self, last_event_id: Optional[str]) -> list[tuple[int, bytes]]:
+        try:
+            after = int(last_event_id) if last_event_id else None
+        except ValueError:
+            after = None
+        if after is None:
+            return []
+        return [(event_id, data) for event_id, data in self.backlog if event_id > after]
+
+
+class NotificationHub:
+    # However many tabs a student has open, each session gets one upstream
+    # poller; new notifications go onto the event bus and every stream for
+    # that session picks them up from there.
+    def __init__(self):
+        self.feeds: OrderedDict[str, SessionFeed] = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+
+    async def stop(self) -> None:
+        tasks = [feed.task for feed in self.feeds.values() if feed.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.feeds.clear()
+
+    def _feed(self, token: str) -> SessionFeed:
+        session = session_key(token)
+        feed = self.feeds.get(session)
+        if feed is None:
+            feed = self.feeds[session] = SessionFeed(token)
+            # Idle feeds keep their dedup state for reconnects, within limits.
+            while len(self.feeds) > settings.sse_max_feeds:
+                oldest = next(iter(self.feeds.values()))
+                if oldest.subscribers:
+                    break
+                del self.feeds[oldest.session]
+        self.feeds.move_to_end(session)
+        return feed
+
+    async def stream(
+        self, token: str, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        feed = self._feed(token)
+        subscription = event_bus.subscribe(feed.session)
+        feed.subscribers += 1
+        if feed.task is None:
+            feed.task = asyncio.create_task(self._poll(feed))
+        try:
+            yield f"retry: {int(settings.sse_retry * 1000)}\n\n".encode()
+            # Subscribed before the replay, so anything published meanwhile
+            # is both replayed and queued; the queued copy is skipped.
+            replayed = 0
+            for event_id, data in feed.replay(last_event_id):
+                replayed = event_id
+                yield sse("notification", data, event_id)
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), settings.sse_heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if event.kind == "notification":
+                    event_id, data = event.data
+                    if event_id <= replayed:
+                        continue
+                    yield sse(event.kind, data, event_id)
+                else:
+                    yield sse(event.kind, orjson.dumps(event.data))
+        finally:
+            subscription.close()
+            feed.subscribers -= 1
+            if not feed.subscribers and feed.task is not None:
+                feed.task.cancel()
+                feed.task = None
+
+    async def _poll(self, feed: SessionFeed) -> None:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=feed.token)
+        while True:
+            try:
+                response = await notification(credentials, self._client, refresh=True)
+                if response.status_code != 200:
+                    raise ValueError(f"notificationstatus returned {response.status_code}")
+                self._publish(feed, NOTIFICATION_MAP.map_many(response.json()))
+                feed.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                feed.failures += 1
+                logger.warning("notification poll failed: %s: %s", type(exc).__name__, exc)
+            interval = min(
+                settings.sse_poll_interval * 2**feed.failures,
+                settings.sse_max_poll_interval,
+            )
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+    def _publish(self, feed: SessionFeed, items: list[NotificationResponse]) -> None:
+        hashes = [notification_hash(item) for item in items]
+        if feed.seen is None:
+            # The first poll is the baseline the client already has from
+            # GET /api/notifications; only later arrivals are pushed.
+            feed.seen = set(hashes)
+            return
+        # The portal lists newest first; push oldest first.
+        seen, feed.seen = feed.seen, set(hashes)
+        for item, digest in reversed(list(zip(items, hashes))):
+            if digest in seen:
+                continue
+            seen.add(digest)
+            feed.last_id += 1
+            data = orjson.dumps(item.model_dump())
+            feed.backlog.append((feed.last_id, data))
+            event_bus.publish(
+                Event("notification", feed.session, (feed.last_id, data))
+            )
+
+    def stats(self) -> dict:
+        return {
+            "feeds": len(self.feeds),
+            "polling": sum(1 for feed in self.feeds.values() if feed.task is not None),
+            "subscribers": sum(feed.subscribers for feed in self.feeds.values()),
+        }
+
+
+notification_hub = NotificationHub()
@@ -1,4 +1,6 @@
-API_BASE_URL = "https://studentportal.universitysolutions.in"
+from app.core.config import settings
+
+API_BASE_URL = settings.api_base_url.rstrip("/")
 
 
 class AuthUrls:
@@ -14,3 +16,25 @@ class MainUrls:
     RESULT_LIST = f"{API_BASE_URL}/src/results_new.php"
     RESULT = f"{API_BASE_URL}/src/results_new.php"
     PASSWORD = f"{API_BASE_URL}/src/chngPassword.php"
+
+
+UPSTREAM_ENDPOINTS = {
+    AuthUrls.OTP: "otp",
+    AuthUrls.RESET_PASSWORD: "reset_password",
+    AuthUrls.SIGNIN: "signin",
+    AuthUrls.SIGNOUT: "signout",
+    MainUrls.PROFILE: "profile",
+    MainUrls.NOTIFICATION: "notifications",
+    MainUrls.PASSWORD: "password",
+}
+
+RESULT_ACTIONS = {
+    "getResAll": "result_list",
+    "getResults": "result",
+}
+
+
+def upstream_endpoint(url: str, action: str | None = None) -> str:
+    if url == MainUrls.RESULT:
+        return RESULT_ACTIONS.get(action, "results")
+    return UPSTREAM_ENDPOINTS.get(url, "other")
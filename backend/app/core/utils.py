@@ -1,31 +1,115 @@
 import json
-import re
 import os
 import sys
 
 
+def _balanced_spans(text: str, track_strings: bool = True):
+    # Walks backwards from the end of the body once, pairing each "{" with the
+    # nearest unmatched "}" to its right. rfind jumps straight between braces
+    # and quotes, and quotes are only tracked while inside a candidate object
+    # so stray quotes in PHP/HTML noise cannot flip the string state.
+    closers: list[int] = []
+    in_string = False
+    open_at = text.rfind("{")
+    close_at = text.rfind("}")
+    quote_at = text.rfind('"') if track_strings else -1
+    while True:
+        # Spans are only yielded at a "{"; with none left there is no more.
+        if open_at < 0:
+            return
+        i = max(open_at, close_at, quote_at)
+        if i == quote_at:
+            quote_at = text.rfind('"', 0, i)
+            if closers:
+                j = i
+                while j and text[j - 1] == "\\":
+                    j -= 1
+                if (i - j) % 2 == 0:
+                    in_string = not in_string
+        elif i == close_at:
+            close_at = text.rfind("}", 0, i)
+            if not in_string:
+                closers.append(i)
+        else:
+            open_at = text.rfind("{", 0, i)
+            if not in_string and closers:
+                yield i, closers.pop(), not closers
+
+
+# Candidate spans tried per body; braces in CSS or templates are not JSON and
+# should not cost a parse each.
+MAX_ATTEMPTS = 32
+
+
+def _parse_object(text: str, start: int, end: int):
+    # A JSON object opens with a key or closes straight away; anything else
+    # (CSS rules, "{x}" placeholders) is rejected without calling json.loads.
+    i = start + 1
+    while i < end and text[i] in " \t\r\n":
+        i += 1
+    if text[i] not in '"}':
+        return None
+    try:
+        return json.loads(text[start : end + 1])
+    except (json.JSONDecodeError, RecursionError):
+        return None
+
+
+def _find_last_object(text: str):
+    # Fast path: pair braces only. If the last balanced block parses it is
+    # exactly what the string-aware pass would find, and usually it does.
+    for start, end, outermost in _balanced_spans(text, track_strings=False):
+        if outermost:
+            candidate = _parse_object(text, start, end)
+            if candidate is not None:
+                return candidate
+            break
+
+    attempts = 0
+    nested: list[tuple[int, int]] = []
+    for start, end, outermost in _balanced_spans(text):
+        if outermost:
+            candidate = _parse_object(text, start, end)
+            if candidate is not None:
+                return candidate
+            attempts += 1
+            if attempts >= MAX_ATTEMPTS:
+                return None
+            continue
+        while nested and start < nested[-1][0] and nested[-1][1] < end:
+            nested.pop()
+        nested.append((start, end))
+
+    # Only reached when stray "}" noise never closed; fall back to the
+    # largest balanced objects found, latest first.
+    for start, end in sorted(nested, key=lambda span: span[1], reverse=True):
+        candidate = _parse_object(text, start, end)
+        if candidate is not None:
+            return candidate
+        attempts += 1
+        if attempts >= MAX_ATTEMPTS:
+            break
+    return None
+
+
 def extract_json(text: str) -> dict:
     try:
         return json.loads(text)
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, RecursionError):
         pass
 
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    if lines:
-        last = lines[-1]
+    stripped = text.rstrip()
+    if stripped:
+        last = stripped[max(stripped.rfind("\n"), stripped.rfind("\r")) + 1 :].strip()
         if last.startswith("{") and last.endswith("}"):
             try:
                 return json.loads(last)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, RecursionError):
                 pass
 
-    matches = list(re.finditer(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text, re.DOTALL))
-    if matches:
-        candidate = matches[-1].group()
-        try:
-            return json.loads(candidate)
-        except json.JSONDecodeError:
-            pass
+    candidate = _find_last_object(text)
+    if candidate is not None:
+        return candidate
 
     raise ValueError("No valid JSON found in the response.")
 
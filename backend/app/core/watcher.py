@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import heapq
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+import orjson
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.cache import session_key
+from app.core.config import settings
+from app.core.events import Event, event_bus
+from app.core.logs import logger
+from app.services.result import result_list
+
+
+def entry_hash(entry: dict) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(entry, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+@dataclass(slots=True)
+class Watch:
+    session: str
+    token: str
+    next_at: float
+    hashes: Optional[dict[str, str]] = None
+    failures: int = 0
+    polls: int = 0
+    changes: int = 0
+    last_poll: float = 0.0
+    enrolled_at: float = field(default_factory=time.time)
+
+
+class ResultWatcher:
+    # One scheduled getResAll poll per enrolled session replaces students
+    # refreshing the result list by hand. Polls are jittered so sessions do not
+    # line up, back off on failures, and share a global concurrency cap; each
+    # poll also refreshes the cached list the /result route serves.
+    def __init__(self):
+        self.watches: dict[str, Watch] = {}
+        self._schedule: list[tuple[float, str]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._polls: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, client: httpx.AsyncClient) -> None:
+        if self._task is not None or not settings.watcher_enabled:
+            return
+        self._client = client
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        for poll in list(self._polls):
+            poll.cancel()
+        await asyncio.gather(self._task, *self._polls, return_exceptions=True)
+        self._task = None
+
+    def enroll(self, token: str) -> Optional[Watch]:
+        # None when the watcher is full; existing watches are always returned.
+        session = session_key(token)
+        watch = self.watches.get(session)
+        if watch is None:
+            if len(self.watches) >= settings.watch_max_sessions:
+                return None
+            watch = self.watches[session] = Watch(
+                session=session, token=token, next_at=time.monotonic()
+            )
+            self._push(watch)
+        return watch
+
+    def unenroll(self, token: str) -> bool:
+        # Stale heap entries for the session are skipped when they come up.
+        return self.watches.pop(session_key(token), None) is not None
+
+    def _push(self, watch: Watch) -> None:
+        heapq.heappush(self._schedule, (watch.next_at, watch.session))
+        self._wakeup.set()
+
+    def _delay(self, watch: Watch) -> float:
+        interval = min(
+            settings.watcher_interval * 2**watch.failures, settings.watcher_max_interval
+        )
+        jitter = settings.watcher_jitter
+        return interval * random.uniform(1 - jitter, 1 + jitter)
+
+    async def _run(self) -> None:
+        limiter = asyncio.Semaphore(settings.watcher_concurrency)
+        while True:
+            self._wakeup.clear()
+            if not self._schedule:
+                await self._wakeup.wait()
+                continue
+            next_at, session = self._schedule[0]
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._schedule)
+            watch = self.watches.get(session)
+            if watch is None or watch.next_at != next_at:
+                continue
+            await limiter.acquire()
+            poll = asyncio.create_task(self._poll(watch, limiter))
+            self._polls.add(poll)
+            poll.add_done_callback(self._polls.discard)
+
+    async def _poll(self, watch: Watch, limiter: asyncio.Semaphore) -> None:
+        try:
+            response = await result_list(
+                HTTPAuthorizationCredentials(scheme="Bearer", credentials=watch.token),
+                self._client,
+                refresh=True,
+            )
+            entries = response.json().get("data") if response.status_code == 200 else None
+            if not isinstance(entries, list):
+                raise ValueError(f"unexpected getResAll response ({response.status_code})")
+            self._diff(watch, entries)
+            watch.failures = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            watch.failures += 1
+            logger.warning("watcher poll failed: %s: %s", type(exc).__name__, exc)
+            if watch.failures >= settings.watcher_max_failures:
+                # Most likely an expired portal session.
+                self.watches.pop(watch.session, None)
+                event_bus.publish(Event("watch.expired", watch.session))
+        finally:
+            limiter.release()
+            watch.polls += 1
+            watch.last_poll = time.time()
+            if self.watches.get(watch.session) is watch:
+                watch.next_at = time.monotonic() + self._delay(watch)
+                self._push(watch)
+
+    def _diff(self, watch: Watch, entries: list[dict]) -> None:
+        hashes = {str(entry.get("year")): entry_hash(entry) for entry in entries}
+        previous, watch.hashes = watch.hashes, hashes
+        if previous is None:
+            return
+        added, changed = [], []
+        for entry in entries:
+            exam_no = str(entry.get("year"))
+            if exam_no not in previous:
+                added.append(entry)
+            elif previous[exam_no] != hashes[exam_no]:
+                changed.append(entry)
+        if added or changed:
+            watch.changes += 1
+            event_bus.publish(
+                Event(
+                    "results.changed",
+                    watch.session,
+                    {"added": added, "changed": changed},
+                )
+            )
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "enabled": settings.watcher_enabled,
+            "running": self.running,
+            "sessions": len(self.watches),
+            "polls_in_flight": len(self._polls),
+            "watches": [
+                {
+                    "session": watch.session[:8],
+                    "polls": watch.polls,
+                    "changes": watch.changes,
+                    "failures": watch.failures,
+                    "next_poll_in": round(max(0.0, watch.next_at - now), 3),
+                }
+                for watch in self.watches.values()
+            ],
+        }
+
+
+result_watcher = ResultWatcher()
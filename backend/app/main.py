@@ -1,38 +1,68 @@
 import os
 from contextlib import asynccontextmanager
+from typing import Annotated
 
 import httpx
-from fastapi import FastAPI
+from fastapi import FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
+from app.core.archive import result_archive
+from app.core.conditional import ConditionalMiddleware
 from app.core.config import settings
-from app.core.http import NullCookieJar, http_state
+from app.core.http import InstrumentedTransport, NullCookieJar, http_state
+from app.core.logs import RequestLogMiddleware, log_pipeline
+from app.core.metrics import MetricsMiddleware
+from app.core.prefetch import prefetcher
+from app.core.spa import PrecompressedStaticFiles, SpaIndex
+from app.core.streams import notification_hub
 from app.core.utils import static_path
-from app.routes import auth, notifications, result, system, user
+from app.core.watcher import result_watcher
+from app.routes import (
+    analytics,
+    auth,
+    batch,
+    export,
+    notifications,
+    result,
+    system,
+    user,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    log_pipeline.start()
+    await result_archive.open()
+    http_state.transport = InstrumentedTransport(
+        http2=settings.http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+    )
     http_state.client = httpx.AsyncClient(
+        transport=http_state.transport,
         cookies=NullCookieJar(),
         timeout=httpx.Timeout(
-            connect=5.0,
-            read=150.0,
-            write=150.0,
-            pool=5.0,
-        ),
-        limits=httpx.Limits(
-            max_connections=100,
-            max_keepalive_connections=20,
+            connect=settings.http_connect_timeout,
+            read=settings.http_read_timeout,
+            write=settings.http_write_timeout,
+            pool=settings.http_pool_timeout,
         ),
         follow_redirects=True,
     )
+    result_watcher.start(http_state.client)
+    notification_hub.start(http_state.client)
     yield
     # Shutdown
+    await prefetcher.stop()
+    await notification_hub.stop()
+    await result_watcher.stop()
     await http_state.client.aclose()
+    await result_archive.close()
+    log_pipeline.stop()
 
 
 app = FastAPI(
@@ -42,12 +72,15 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(ConditionalMiddleware)
 app.add_middleware(
     middleware_class=CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestLogMiddleware)
 
 static_dir = static_path()
 
@@ -58,12 +91,24 @@ app.include_router(router=result.router, prefix="/api/result", tags=["result"])
 app.include_router(
     router=notifications.router, prefix="/api/notifications", tags=["notifications"]
 )
+app.include_router(router=batch.router, prefix="/api/batch", tags=["batch"])
+app.include_router(
+    router=analytics.router, prefix="/api/analytics", tags=["analytics"]
+)
+app.include_router(router=export.router, prefix="/api/export", tags=["export"])
 
 # print(f"static_dir -> {static_dir} | exists? -> {os.path.isdir(static_dir)} | index.html exists? -> {os.path.isfile(os.path.join(static_dir, 'index.html'))}")
 
 if os.path.isdir(static_dir) and os.path.isfile(os.path.join(static_dir, "index.html")):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    app.mount(
+        "/static", PrecompressedStaticFiles(directory=static_dir), name="static"
+    )
+    spa_index = SpaIndex(os.path.join(static_dir, "index.html"))
 
-    @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
-        return FileResponse(os.path.join(static_dir, "index.html"))
+    @app.get("/{full_path:path}", include_in_schema=False)
+    async def serve_spa(
+        full_path: str,
+        accept_encoding: Annotated[str, Header()] = "",
+        if_none_match: Annotated[str | None, Header()] = None,
+    ):
+        return spa_index.response(accept_encoding, if_none_match)
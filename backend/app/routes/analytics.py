@@ -0,0 +1,84 @@
+from fastapi import APIRouter, status, HTTPException, Depends
+import httpx
+from typing import Annotated
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.analytics import ANALYTICS, ResultHistory
+from app.core.http import HTTPClientDep, security
+from app.core.responses import EncodedRoute
+from app.routes.result import fetch_all_results
+from app.schemas.result import AllResultsResponse
+
+router = APIRouter(route_class=EncodedRoute)
+
+
+async def load_history(
+    token: HTTPAuthorizationCredentials, client: httpx.AsyncClient
+) -> ResultHistory:
+    if not ANALYTICS:
+        raise HTTPException(503, "Analytics needs numpy (install the 'analytics' extra)")
+    # Same path as /result/all, so archived exams cost no portal calls.
+    response = await fetch_all_results(token, client)
+    if not isinstance(response, AllResultsResponse):
+        raise HTTPException(502, "Could not load result history")
+    # The portal lists the newest exam first.
+    return ResultHistory(
+        [
+            (exam.exam_no, exam.data)
+            for exam in reversed(response.results)
+            if exam.data is not None
+        ]
+    )
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def fetch_analytics(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    try:
+        return (await load_history(token, client)).analyze()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.get("/trend", status_code=status.HTTP_200_OK)
+async def fetch_trend(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    try:
+        return (await load_history(token, client)).trend()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.get("/distribution", status_code=status.HTTP_200_OK)
+async def fetch_distribution(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    try:
+        return (await load_history(token, client)).distribution()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.get("/backlogs", status_code=status.HTTP_200_OK)
+async def fetch_backlogs(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    try:
+        history = await load_history(token, client)
+        return {"summary": history.summary(), "backlogs": history.backlogs()}
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
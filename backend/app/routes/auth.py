@@ -1,29 +1,34 @@
 from fastapi import APIRouter, status, HTTPException, Depends
 from fastapi.security import HTTPAuthorizationCredentials
 import httpx
-import time
 from typing import Annotated
 
+from app.core.archive import result_archive
+from app.core.breaker import CircuitOpenError
+from app.core.cache import response_cache
+from app.core.export import export_cache
 from app.core.http import HTTPClientDep, security
+from app.core.photos import photo_store
+from app.core.prefetch import prefetcher
+from app.core.watcher import result_watcher
+from app.core.responses import EncodedRoute
 from app.services.auth import signin, signout, otp, reset_password
-from app.schemas.auth import LoginResponse
+from app.schemas.auth import LOGIN_MAP
 from app.core.utils import extract_json
 
-router = APIRouter()
+router = APIRouter(route_class=EncodedRoute)
 
 
 @router.post("/send-otp", status_code=status.HTTP_200_OK)
 async def send_password_reset_otp(mobile_no: str, client: HTTPClientDep):
-    start_time = time.perf_counter()
     try:
         response = await otp(mobile_no, client)
-        print(
-            f"[send_password_reset_otp]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-        )
         return response.json()
 
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -36,16 +41,14 @@ async def send_password_reset_otp(mobile_no: str, client: HTTPClientDep):
 async def reset_password_using_otp(
     mobile_no: str, otp: str, new_password: str, client: HTTPClientDep
 ):
-    start_time = time.perf_counter()
     try:
         response = await reset_password(mobile_no, otp, new_password, client)
-        print(
-            f"[reset_password_using_otp]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-        )
         return response.json()
 
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -56,18 +59,14 @@ async def reset_password_using_otp(
 
 @router.post("/login", status_code=status.HTTP_200_OK)
 async def user_login(mobile_no: str, password: str, client: HTTPClientDep):
-    start_time = time.perf_counter()
     try:
         response = await signin(mobile_no, password, client)
         data = extract_json(response.text)
         if response.status_code == 200:
             if response.cookies.get("PHPSESSID") is not None:
-                print(
-                    f"[user_login]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-                )
-                return LoginResponse(
-                    session_id=response.cookies.get("PHPSESSID"), msg=data.get("msg")
-                )
+                session_id = response.cookies.get("PHPSESSID")
+                prefetcher.start(session_id, client)
+                return LOGIN_MAP.map(data, session_id=session_id)
             else:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,6 +79,8 @@ async def user_login(mobile_no: str, password: str, client: HTTPClientDep):
             )
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -93,14 +94,17 @@ async def user_logout(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
     try:
+        await response_cache.invalidate(token.credentials)
+        await result_archive.unbind(token.credentials)
+        result_watcher.unenroll(token.credentials)
+        photo_store.invalidate(token.credentials)
+        export_cache.invalidate(token.credentials)
         response = await signout(token, client)
-        print(
-            f"[user_logout]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-        )
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
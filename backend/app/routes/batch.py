@@ -0,0 +1,69 @@
+from fastapi import APIRouter, status, HTTPException, Depends
+import asyncio
+from typing import Annotated
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.config import settings
+from app.core.http import HTTPClientDep, security
+from app.core.responses import EncodedRoute
+from app.routes.notifications import fetch_notifications
+from app.routes.result import fetch_result, fetch_result_list
+from app.routes.user import fetch_profile
+from app.schemas.batch import BatchOperation, BatchRequest, BatchResponse, BatchResult
+
+router = APIRouter(route_class=EncodedRoute)
+
+
+async def run_operation(
+    operation: BatchOperation,
+    token: HTTPAuthorizationCredentials,
+    client: HTTPClientDep,
+) -> BatchResult:
+    # Operations call the same handlers as their standalone routes, so they
+    # share the cache, archive, breakers and error mapping.
+    try:
+        if operation.op == "profile":
+            data = await fetch_profile(token, client)
+        elif operation.op == "result_list":
+            data = await fetch_result_list(token, client)
+        elif operation.op == "notifications":
+            data = await fetch_notifications(token, client)
+        else:
+            if not operation.exam_no or not operation.reg_no:
+                raise HTTPException(422, "result needs exam_no and reg_no")
+            data = await fetch_result(operation.exam_no, operation.reg_no, token, client)
+        return BatchResult(id=operation.id, op=operation.op, status_code=200, data=data)
+    except HTTPException as exc:
+        return BatchResult(
+            id=operation.id,
+            op=operation.op,
+            status_code=exc.status_code,
+            error=exc.detail,
+        )
+    except Exception as exc:
+        return BatchResult(
+            id=operation.id,
+            op=operation.op,
+            status_code=500,
+            error=f"Unexpected error: {exc}",
+        )
+
+
+@router.post("", status_code=status.HTTP_200_OK)
+async def run_batch(
+    batch: BatchRequest,
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    if len(batch.operations) > settings.batch_max_operations:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
+            f"At most {settings.batch_max_operations} operations per batch",
+        )
+    results = await asyncio.gather(
+        *[run_operation(operation, token, client) for operation in batch.operations]
+    )
+    return BatchResponse(
+        results=results,
+        failed=sum(1 for result in results if result.error is not None),
+    )
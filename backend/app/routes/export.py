@@ -0,0 +1,77 @@
+from fastapi import APIRouter, status, HTTPException, Depends, Header, Query
+from fastapi.responses import Response, StreamingResponse
+import asyncio
+import httpx
+from typing import Annotated, Literal
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.archive import result_archive
+from app.core.breaker import CircuitOpenError
+from app.core.conditional import etag_matches
+from app.core.config import settings
+from app.core.export import MEDIA_TYPES, export_cache, export_digest, first_available
+from app.core.http import HTTPClientDep, security
+from app.core.responses import EncodedRoute
+from app.routes.result import stream_results
+from app.services.result import result_list
+
+router = APIRouter(route_class=EncodedRoute)
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def export_results(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+    fmt: Annotated[Literal["csv", "xlsx", "pdf"], Query(alias="format")] = "csv",
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    try:
+        response = await result_list(token, client)
+        if response.status_code != 200:
+            return response.json()
+        entries = response.json().get("data") or []
+    except HTTPException:
+        raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
+    except httpx.TimeoutException:
+        raise HTTPException(504, "External API timed out")
+    except httpx.NetworkError:
+        raise HTTPException(502, "Could not reach external API")
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+    if not entries:
+        raise HTTPException(404, "No results to export")
+    reg_no = entries[0].get("regno")
+    await result_archive.bind(token.credentials, reg_no)
+
+    digest = export_digest(fmt, entries)
+    etag = f'"{digest}"'
+    headers = {
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f'attachment; filename="results-{reg_no or "export"}.{fmt}"',
+    }
+    # Only complete exports are cached, so only they carry the ETag; a
+    # streamed one may still turn out partial.
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    cached = export_cache.get(digest)
+    if cached is not None:
+        return Response(
+            cached.content,
+            media_type=MEDIA_TYPES[fmt],
+            headers={**headers, "ETag": etag},
+        )
+
+    # Oldest exam first; each one is written out as soon as it is available.
+    limiter = asyncio.Semaphore(max(settings.result_fanout_limit, 1))
+    results = await first_available(
+        stream_results(list(reversed(entries)), token, client, limiter)
+    )
+    if results is None:
+        raise HTTPException(502, "Could not fetch any result to export")
+    return StreamingResponse(
+        export_cache.build(digest, token.credentials, fmt, results),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, status, HTTPException, Depends
+from fastapi import APIRouter, status, HTTPException, Depends, Header
+from fastapi.responses import StreamingResponse
 import httpx
-import time
 from typing import Annotated
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.core.breaker import CircuitOpenError
 from app.core.http import HTTPClientDep, security
+from app.core.responses import EncodedRoute
+from app.core.streams import notification_hub
 from app.services.notifications import notification
-from app.schemas.notification import (
-    NotificationResponse,
-)
+from app.schemas.notification import NOTIFICATION_MAP
 
-router = APIRouter()
+router = APIRouter(route_class=EncodedRoute)
 
 
 @router.get("", status_code=status.HTTP_200_OK)
@@ -18,29 +19,32 @@ async def fetch_notifications(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
     try:
         response = await notification(token, client)
 
+        data = response.json()
         if response.status_code == 200:
-            data = response.json()
-            print(
-                f"[fetch_notifications]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-            )
-            return [
-                NotificationResponse(
-                    title=noti.get("ftitle"),
-                    body=noti.get("fbody"),
-                    date=noti.get("fpushdate"),
-                )
-                for noti in data
-            ]
-        return response.json()
+            return NOTIFICATION_MAP.map_many(data)
+        return data
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
         raise HTTPException(502, "Could not reach external API")
     except Exception as exc:
         raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.get("/stream", status_code=status.HTTP_200_OK)
+async def stream_notifications(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    last_event_id: Annotated[str | None, Header()] = None,
+):
+    return StreamingResponse(
+        notification_hub.stream(token.credentials, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,20 +1,165 @@
 from fastapi import APIRouter, status, HTTPException, Depends
+import asyncio
 import httpx
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 from fastapi.security import HTTPAuthorizationCredentials
-import time
 
+from app.core.archive import result_archive
+from app.core.breaker import CircuitOpenError
+from app.core.config import settings
 from app.core.http import HTTPClientDep, security
+from app.core.responses import EncodedRoute
+from app.core.watcher import result_watcher
 from app.services.result import result_list, result
 from app.schemas.result import (
-    ResultListResponse,
-    StudentDetail,
-    SubjectResult,
-    ResultResponse,
-    ResultInfo,
+    ExamResult,
+    AllResultsResponse,
+    RESULT_LIST_MAP,
+    RESULT_MAP,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=EncodedRoute)
+
+
+async def fetch_exam_result(
+    exam_no: str,
+    reg_no: str,
+    token: HTTPAuthorizationCredentials,
+    client: httpx.AsyncClient,
+    limiter: asyncio.Semaphore,
+    rv_result_date: str | None = None,
+) -> ExamResult:
+    async with limiter:
+        try:
+            response = await result(exam_no, reg_no, token, client)
+            if response.status_code != 200:
+                return ExamResult(
+                    exam_no=exam_no,
+                    reg_no=reg_no,
+                    status_code=response.status_code,
+                    error=response.text,
+                )
+            data = RESULT_MAP.map(response.json())
+            if data.subjects:
+                await result_archive.store(reg_no, exam_no, data, rv_result_date)
+            return ExamResult(
+                exam_no=exam_no, reg_no=reg_no, status_code=200, data=data
+            )
+        except HTTPException as exc:
+            return ExamResult(
+                exam_no=exam_no,
+                reg_no=reg_no,
+                status_code=exc.status_code,
+                error=exc.detail,
+            )
+        except CircuitOpenError as exc:
+            return ExamResult(
+                exam_no=exam_no, reg_no=reg_no, status_code=503, error=str(exc)
+            )
+        except httpx.TimeoutException:
+            return ExamResult(
+                exam_no=exam_no,
+                reg_no=reg_no,
+                status_code=504,
+                error="External API timed out",
+            )
+        except httpx.NetworkError:
+            return ExamResult(
+                exam_no=exam_no,
+                reg_no=reg_no,
+                status_code=502,
+                error="Could not reach external API",
+            )
+        except Exception as exc:
+            return ExamResult(
+                exam_no=exam_no,
+                reg_no=reg_no,
+                status_code=500,
+                error=f"Unexpected error: {exc}",
+            )
+
+
+async def archived_result(
+    entry: dict,
+    token: HTTPAuthorizationCredentials,
+    revisions: dict[str, dict[str, str]],
+) -> ExamResult | None:
+    exam_no, reg_no = entry.get("year"), entry.get("regno")
+    if reg_no not in revisions:
+        revisions[reg_no] = await result_archive.revisions(reg_no)
+    if revisions[reg_no].get(exam_no) == (entry.get("rvresultdate") or ""):
+        archived = await result_archive.get(token.credentials, reg_no, exam_no)
+        if archived is not None:
+            return ExamResult(
+                exam_no=exam_no, reg_no=reg_no, status_code=200, data=archived
+            )
+    return None
+
+
+async def sync_results(
+    entries: list[dict],
+    token: HTTPAuthorizationCredentials,
+    client: httpx.AsyncClient,
+    limiter: asyncio.Semaphore,
+) -> tuple[list[ExamResult], int]:
+    # Only exams missing from the archive, or whose revaluation date moved
+    # since they were archived, are fetched from the portal.
+    results: list[ExamResult | None] = [None] * len(entries)
+    revisions: dict[str, dict[str, str]] = {}
+    pending = []
+    for i, entry in enumerate(entries):
+        results[i] = await archived_result(entry, token, revisions)
+        if results[i] is None:
+            pending.append(i)
+    fetched = await asyncio.gather(
+        *[
+            fetch_exam_result(
+                entries[i].get("year"),
+                entries[i].get("regno"),
+                token,
+                client,
+                limiter,
+                entries[i].get("rvresultdate"),
+            )
+            for i in pending
+        ]
+    )
+    for i, exam in zip(pending, fetched):
+        results[i] = exam
+    return results, len(entries) - len(pending)
+
+
+async def stream_results(
+    entries: list[dict],
+    token: HTTPAuthorizationCredentials,
+    client: httpx.AsyncClient,
+    limiter: asyncio.Semaphore,
+) -> AsyncIterator[ExamResult]:
+    # Like sync_results, but yields each exam in list order as soon as it and
+    # the ones before it are ready, while later ones are still being fetched.
+    revisions: dict[str, dict[str, str]] = {}
+    pending: list[ExamResult | asyncio.Future] = []
+    try:
+        for entry in entries:
+            pending.append(
+                await archived_result(entry, token, revisions)
+                or asyncio.ensure_future(
+                    fetch_exam_result(
+                        entry.get("year"),
+                        entry.get("regno"),
+                        token,
+                        client,
+                        limiter,
+                        entry.get("rvresultdate"),
+                    )
+                )
+            )
+        for item in pending:
+            yield item if isinstance(item, ExamResult) else await item
+    finally:
+        for item in pending:
+            if isinstance(item, asyncio.Future):
+                item.cancel()
 
 
 @router.get("", status_code=status.HTTP_200_OK)
@@ -22,36 +167,135 @@ async def fetch_result_list(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
     try:
         response = await result_list(token, client)
 
+        data = response.json()
         if response.status_code == 200:
-            print(
-                f"[fetch_result_list]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
+            entries = data.get("data")
+            if entries:
+                await result_archive.bind(token.credentials, entries[0].get("regno"))
+            return RESULT_LIST_MAP.map_many(entries)
+        return data
+    except HTTPException:
+        raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
+    except httpx.TimeoutException:
+        raise HTTPException(504, "External API timed out")
+    except httpx.NetworkError:
+        raise HTTPException(502, "Could not reach external API")
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.get("/all", status_code=status.HTTP_200_OK)
+async def fetch_all_results(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+    concurrency: int | None = None,
+):
+    try:
+        try:
+            response = await result_list(token, client)
+        except (HTTPException, httpx.TransportError):
+            # Portal unreachable or circuit open: fall back to the archive.
+            archived = await result_archive.exams(token.credentials)
+            if not archived:
+                raise
+            return AllResultsResponse(
+                results=[
+                    ExamResult(
+                        exam_no=exam_no, reg_no=reg_no, status_code=200, data=data
+                    )
+                    for reg_no, exam_no, data in archived
+                ],
+                archived=len(archived),
             )
-            return [
-                ResultListResponse(
-                    year=result.get("year"),
-                    exam_date=result.get("examdate"),
-                    exam_name=result.get("examname"),
-                    result_date=result.get("resultdate"),
-                    rv_result_date=result.get("rvresultdate"),
-                    reg_no=result.get("regno"),
-                    mc_no=result.get("mcnumber"),
-                    status=result.get("class"),
-                )
-                for result in response.json().get("data")
-            ]
-        return response.json()
+        if response.status_code != 200:
+            return response.json()
+
+        entries = response.json().get("data") or []
+        if entries:
+            await result_archive.bind(token.credentials, entries[0].get("regno"))
+
+        limit = min(
+            concurrency or settings.result_fanout_limit, settings.result_fanout_limit
+        )
+        limiter = asyncio.Semaphore(max(limit, 1))
+        results, archived = await sync_results(entries, token, client, limiter)
+        return AllResultsResponse(
+            results=results,
+            failed=sum(1 for exam in results if exam.error is not None),
+            archived=archived,
+        )
+    except HTTPException:
+        raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
+    except httpx.TimeoutException:
+        raise HTTPException(504, "External API timed out")
+    except httpx.NetworkError:
+        raise HTTPException(502, "Could not reach external API")
+    except Exception as exc:
+        raise HTTPException(500, f"Unexpected error: {exc}")
+
+
+@router.post("/watch", status_code=status.HTTP_202_ACCEPTED)
+async def watch_results(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    client: HTTPClientDep,
+):
+    if not result_watcher.running:
+        raise HTTPException(503, "Result watcher is disabled")
+    # Only sessions the portal accepts are polled.
+    try:
+        response = await result_list(token, client)
+        entries = response.json().get("data") if response.status_code == 200 else None
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
         raise HTTPException(502, "Could not reach external API")
     except Exception as exc:
         raise HTTPException(500, f"Unexpected error: {exc}")
+    if not isinstance(entries, list):
+        raise HTTPException(401, "Invalid or expired portal session")
+    watch = result_watcher.enroll(token.credentials)
+    if watch is None:
+        raise HTTPException(503, "Too many watched sessions, retry later")
+    return {"status": "watching", "polls": watch.polls, "changes": watch.changes}
+
+
+@router.delete("/watch", status_code=status.HTTP_204_NO_CONTENT)
+async def unwatch_results(
+    token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+):
+    result_watcher.unenroll(token.credentials)
+
+
+async def current_revision(
+    exam_no: str,
+    reg_no: str,
+    token: HTTPAuthorizationCredentials,
+    client: httpx.AsyncClient,
+) -> str | None:
+    try:
+        response = await result_list(token, client)
+    except (HTTPException, httpx.TransportError):
+        return None
+    if response.status_code != 200:
+        return None
+    entries = response.json().get("data") or []
+    if entries:
+        await result_archive.bind(token.credentials, entries[0].get("regno"))
+    for entry in entries:
+        if entry.get("year") == exam_no and entry.get("regno") == reg_no:
+            return entry.get("rvresultdate") or ""
+    return None
 
 
 @router.get("/{exam_no}", status_code=status.HTTP_200_OK)
@@ -61,48 +305,39 @@ async def fetch_result(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
     try:
-        response = await result(exam_no, reg_no, token, client)
+        # The archived copy is only current while the exam's revaluation date
+        # in the (cached) result list still matches the one it was stored with.
+        revision = await current_revision(exam_no, reg_no, token, client)
+        if revision is not None:
+            archived = await archived_result(
+                {"year": exam_no, "regno": reg_no, "rvresultdate": revision}, token, {}
+            )
+            if archived is not None:
+                return archived.data
+        try:
+            response = await result(exam_no, reg_no, token, client)
+        except (HTTPException, httpx.TransportError):
+            # Portal unreachable or circuit open: fall back to the archive.
+            archived = await result_archive.get(token.credentials, reg_no, exam_no)
+            if archived is None:
+                raise
+            return archived
 
+        data = response.json()
         if response.status_code == 200:
-            print(
-                f"[fetch_result]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-            )
-            return ResultResponse(
-                student_details=StudentDetail(
-                    sem=response.json().get("studDet").get("FEXAMNAME"),
-                    full_sem=response.json().get("studDet").get("FDESCPN"),
-                    exam_date=response.json().get("studDet").get("FRESEXAMDATE"),
-                    exam_no=response.json().get("studDet").get("FEXAMNO"),
-                ),
-                result=ResultInfo(
-                    result=response.json().get("body")[0].get("result"),
-                    cgpa=response.json().get("body")[0].get("FCGPA"),
-                    sgpa=response.json().get("body")[0].get("FSGPA"),
-                    percentage=response.json().get("body")[0].get("FPERCENT"),
-                ),
-                subjects=[
-                    SubjectResult(
-                        id=sub_result.get("sl_no"),
-                        sub=sub_result.get("subject"),
-                        exam_type=sub_result.get("mthprue"),
-                        ese_marks=sub_result.get("uni_exam"),
-                        viva_marks=sub_result.get("viva_exam"),
-                        ia_marks=sub_result.get("ia_exam"),
-                        total_marks=sub_result.get("thtot"),
-                        credits=sub_result.get("FCREDITS"),
-                        grade_points=sub_result.get("FGP"),
-                        credit_points=sub_result.get("FCP"),
-                        remarks=sub_result.get("remarks1"),
-                        grade=sub_result.get("remarks"),
-                    )
-                    for sub_result in response.json().get("body")
-                ],
-            )
-        return response.json()
+            mapped = RESULT_MAP.map(data)
+            # reg_no comes from the query string; only archive it for the
+            # student this session is bound to.
+            owner = await result_archive.owner(token.credentials)
+            if mapped.subjects and owner == reg_no:
+                await result_archive.store(reg_no, exam_no, mapped, revision)
+            return mapped
+        return data
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -1,16 +1,26 @@
 from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
-import time
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.core.archive import result_archive
+from app.core.breaker import breakers
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.events import event_bus
+from app.core.export import export_cache
+from app.core.hedging import hedge_policy
+from app.core.http import http_state
+from app.core.metrics import registry
+from app.core.photos import photo_store
+from app.core.prefetch import prefetcher
+from app.core.responses import EncodedRoute
+from app.core.streams import notification_hub
+from app.core.watcher import result_watcher
 
-router = APIRouter()
+router = APIRouter(route_class=EncodedRoute)
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def root_endpoint():
-    start_time = time.perf_counter()
-    print(f"[root_endpoint]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms")
     return JSONResponse(
         {
             "name": "uniclare-client-api",
@@ -22,6 +32,56 @@ async def root_endpoint():
 
 @router.get("/health", status_code=status.HTTP_200_OK)
 async def health_check():
-    start_time = time.perf_counter()
-    print(f"[health_check]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms")
     return JSONResponse({"status": "healthy"})
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def cache_stats():
+    return JSONResponse(
+        {
+            **(await response_cache.stats()),
+            "photos": photo_store.stats(),
+            "exports": export_cache.stats(),
+            "prefetch": prefetcher.stats(),
+        }
+    )
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def pool_stats():
+    if http_state.transport is None:
+        return JSONResponse({"status": "not initialized"}, status_code=503)
+    return JSONResponse(http_state.transport.stats())
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/breakers", status_code=status.HTTP_200_OK)
+async def breaker_stats():
+    return JSONResponse(breakers.stats())
+
+
+@router.get("/hedging", status_code=status.HTTP_200_OK)
+async def hedging_stats():
+    return JSONResponse(hedge_policy.stats())
+
+
+@router.get("/archive", status_code=status.HTTP_200_OK)
+async def archive_stats():
+    return JSONResponse(await result_archive.stats())
+
+
+@router.get("/watcher", status_code=status.HTTP_200_OK)
+async def watcher_stats():
+    return JSONResponse(
+        {
+            **result_watcher.stats(),
+            "streams": notification_hub.stats(),
+            "events": event_bus.stats(),
+        }
+    )
@@ -1,17 +1,20 @@
-from fastapi import APIRouter, status, HTTPException, Depends
+from fastapi import APIRouter, status, HTTPException, Depends, Header, Response
 from fastapi.responses import JSONResponse
+import hashlib
 import httpx
 from typing import Annotated
 from fastapi.security import HTTPAuthorizationCredentials
-import time
 
+from app.core.breaker import CircuitOpenError
+from app.core.cache import response_cache
+from app.core.config import settings
 from app.core.http import HTTPClientDep, security
+from app.core.photos import photo_store
+from app.core.responses import EncodedRoute
 from app.services.user import profile, update_password, verify_password
-from app.schemas.user import (
-    UserResponse,
-)
+from app.schemas.user import USER_MAP
 
-router = APIRouter()
+router = APIRouter(route_class=EncodedRoute)
 
 
 @router.get("", status_code=status.HTTP_200_OK)
@@ -19,34 +22,19 @@ async def fetch_profile(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
     try:
         response = await profile(token, client)
 
+        data = response.json()
         if response.status_code == 200:
-            data = response.json()
-            print(
-                f"[fetch_profile]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-            )
-            return UserResponse(
-                full_name=data.get("fname"),
-                fat_name=data.get("ffatname"),
-                mot_name=data.get("fmotname"),
-                degree=data.get("fdegree"),
-                degree_code=data.get("fdeggrp"),
-                college=data.get("college"),
-                college_code=data.get("fcollcode"),
-                photo=data.get("photo"),
-                category=data.get("category"),
-                fee_type=data.get("feetype"),
-                reg_no=data.get("strRegno"),
-                mob_no=data.get("strMobile"),
-                email=data.get("strEmail"),
-                parent_mob_no=data.get("strParentMob"),
-            )
-        return response.json()
+            user = USER_MAP.map(data)
+            user.photo = photo_store.register(token.credentials, user.photo, client)
+            return user
+        return data
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -55,6 +43,27 @@ async def fetch_profile(
         raise HTTPException(500, f"Unexpected error: {exc}")
 
 
+@router.get("/photo/{photo_id}", status_code=status.HTTP_200_OK)
+async def fetch_photo(
+    photo_id: str,
+    size: int | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    if size is not None and size not in settings.photo_sizes:
+        raise HTTPException(
+            400, f"size must be one of {', '.join(map(str, settings.photo_sizes))}"
+        )
+    photo = await photo_store.get(photo_id, size)
+    if photo is None:
+        raise HTTPException(404, "Photo not found")
+
+    etag = f'"{hashlib.blake2b(photo.content, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if if_none_match is not None and etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(photo.content, media_type=photo.content_type, headers=headers)
+
+
 @router.patch("/change-password", status_code=status.HTTP_200_OK)
 async def change_user_password(
     current_password: str,
@@ -62,38 +71,36 @@ async def change_user_password(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    start_time = time.perf_counter()
+    await response_cache.invalidate(token.credentials)
     try:
         response = await verify_password(current_password, token, client)
+        data = response.json()
 
-        if response.status_code == 200 and response.json().get("error_code") == 0:
+        if response.status_code == 200 and data.get("error_code") == 0:
             new_response = await update_password(new_password, token, client)
-            if (
-                new_response.status_code == 200
-                and new_response.json().get("error_code") == 0
-            ):
-                print(
-                    f"[change_user_password]: Time -> {(time.perf_counter() - start_time) * 1000:.3f}ms"
-                )
+            new_data = new_response.json()
+            if new_response.status_code == 200 and new_data.get("error_code") == 0:
                 return JSONResponse(
                     {
-                        "status": new_response.json().get("status"),
-                        "msg": new_response.json().get("msg"),
+                        "status": new_data.get("status"),
+                        "msg": new_data.get("msg"),
                     }
                 )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"{new_response.json().get('error_code')} -> {new_response.json().get('data')}",
+                    detail=f"{new_data.get('error_code')} -> {new_data.get('data')}",
                 )
 
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"{response.json().get('error_code')} -> {response.json().get('data')}",
+                detail=f"{data.get('error_code')} -> {data.get('data')}",
             )
     except HTTPException:
         raise
+    except CircuitOpenError as exc:
+        raise exc.http_error()
     except httpx.TimeoutException:
         raise HTTPException(504, "External API timed out")
     except httpx.NetworkError:
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SemesterTrend(BaseModel):
+    exam_no: Optional[str] = None
+    sem: Optional[str] = None
+    subjects: int
+    credits: float
+    earned_credits: float
+    sgpa: Optional[float] = None
+    cgpa: Optional[float] = None
+    reported_sgpa: Optional[float] = None
+    reported_cgpa: Optional[float] = None
+    percentage: Optional[float] = None
+
+
+class ComponentDistribution(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    p25: Optional[float] = None
+    median: Optional[float] = None
+    p75: Optional[float] = None
+    max: Optional[float] = None
+    bins: List[float] = []
+    histogram: List[int] = []
+
+
+class Backlog(BaseModel):
+    sub: Optional[str] = None
+    attempts: int
+    cleared: bool
+    last_exam_no: Optional[str] = None
+
+
+class CreditSummary(BaseModel):
+    credits: float
+    earned_credits: float
+    cgpa: Optional[float] = None
+    reported_cgpa: Optional[float] = None
+    active_backlogs: int
+    cleared_backlogs: int
+
+
+class AnalyticsResponse(BaseModel):
+    exams: int
+    summary: CreditSummary
+    trend: List[SemesterTrend]
+    distribution: Dict[str, ComponentDistribution]
+    backlogs: List[Backlog]
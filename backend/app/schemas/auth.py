@@ -2,7 +2,12 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.mapping import FieldMap
+
 
 class LoginResponse(BaseModel):
     session_id: Optional[str] = Field(None)
     msg: Optional[str] = Field(None)
+
+
+LOGIN_MAP = FieldMap(LoginResponse, {"msg": "msg"})
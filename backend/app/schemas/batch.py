@@ -0,0 +1,27 @@
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchOperation(BaseModel):
+    id: Optional[str] = Field(None)
+    op: Literal["profile", "result_list", "result", "notifications"]
+    exam_no: Optional[str] = Field(None)
+    reg_no: Optional[str] = Field(None)
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(min_length=1)
+
+
+class BatchResult(BaseModel):
+    id: Optional[str] = None
+    op: str
+    status_code: int
+    data: Any = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+    failed: int = 0
@@ -2,8 +2,20 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.mapping import FieldMap
+
 
 class NotificationResponse(BaseModel):
     title: Optional[str] = Field(None)
     body: Optional[str] = Field(None)
     date: Optional[str] = Field(None)
+
+
+NOTIFICATION_MAP = FieldMap(
+    NotificationResponse,
+    {
+        "title": "ftitle",
+        "body": "fbody",
+        "date": "fpushdate",
+    },
+)
@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.mapping import FieldMap, Many, One
+
 
 class ResultListResponse(BaseModel):
     year: Optional[str] = Field(None)
@@ -47,3 +49,79 @@ class ResultResponse(BaseModel):
     student_details: StudentDetail
     result: ResultInfo
     subjects: List[SubjectResult]
+
+
+class ExamResult(BaseModel):
+    exam_no: Optional[str] = None
+    reg_no: Optional[str] = None
+    status_code: int
+    data: Optional[ResultResponse] = None
+    error: Optional[str] = None
+
+
+class AllResultsResponse(BaseModel):
+    results: List[ExamResult]
+    failed: int = 0
+    archived: int = 0
+
+
+RESULT_LIST_MAP = FieldMap(
+    ResultListResponse,
+    {
+        "year": "year",
+        "exam_date": "examdate",
+        "exam_name": "examname",
+        "result_date": "resultdate",
+        "rv_result_date": "rvresultdate",
+        "reg_no": "regno",
+        "mc_no": "mcnumber",
+        "status": "class",
+    },
+)
+
+SUBJECT_RESULT_MAP = FieldMap(
+    SubjectResult,
+    {
+        "id": "sl_no",
+        "sub": "subject",
+        "exam_type": "mthprue",
+        "ese_marks": "uni_exam",
+        "viva_marks": "viva_exam",
+        "ia_marks": "ia_exam",
+        "total_marks": "thtot",
+        "credits": "FCREDITS",
+        "grade_points": "FGP",
+        "credit_points": "FCP",
+        "remarks": "remarks1",
+        "grade": "remarks",
+    },
+)
+
+STUDENT_DETAIL_MAP = FieldMap(
+    StudentDetail,
+    {
+        "sem": "FEXAMNAME",
+        "full_sem": "FDESCPN",
+        "exam_date": "FRESEXAMDATE",
+        "exam_no": "FEXAMNO",
+    },
+)
+
+RESULT_INFO_MAP = FieldMap(
+    ResultInfo,
+    {
+        "result": "result",
+        "cgpa": "FCGPA",
+        "sgpa": "FSGPA",
+        "percentage": "FPERCENT",
+    },
+)
+
+RESULT_MAP = FieldMap(
+    ResultResponse,
+    {
+        "student_details": One(STUDENT_DETAIL_MAP, "studDet"),
+        "result": One(RESULT_INFO_MAP, "body", 0),
+        "subjects": Many(SUBJECT_RESULT_MAP, "body"),
+    },
+)
@@ -2,6 +2,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.core.mapping import FieldMap
+
 
 class UserResponse(BaseModel):
     full_name: Optional[str] = Field(None)
@@ -18,3 +20,24 @@ class UserResponse(BaseModel):
     mob_no: Optional[str] = Field(None)
     email: Optional[str] = Field(None)
     parent_mob_no: Optional[str] = Field(None)
+
+
+USER_MAP = FieldMap(
+    UserResponse,
+    {
+        "full_name": "fname",
+        "fat_name": "ffatname",
+        "mot_name": "fmotname",
+        "degree": "fdegree",
+        "degree_code": "fdeggrp",
+        "college": "college",
+        "college_code": "fcollcode",
+        "photo": "photo",
+        "category": "category",
+        "fee_type": "feetype",
+        "reg_no": "strRegno",
+        "mob_no": "strMobile",
+        "email": "strEmail",
+        "parent_mob_no": "strParentMob",
+    },
+)
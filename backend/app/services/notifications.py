@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.core.cache import response_cache
 from app.core.http import HTTPClientDep, security
 from app.core.urls import MainUrls
 from app.core.constants import authenticated_headers
@@ -11,7 +12,13 @@ from app.core.constants import authenticated_headers
 async def notification(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
+    refresh: bool = False,
 ):
-    return await client.get(
-        url=MainUrls.NOTIFICATION, headers=authenticated_headers(token.credentials)
+    return await response_cache.fetch(
+        "notifications",
+        token.credentials,
+        lambda: client.get(
+            url=MainUrls.NOTIFICATION, headers=authenticated_headers(token.credentials)
+        ),
+        refresh=refresh,
     )
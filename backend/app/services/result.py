@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.core.cache import response_cache
 from app.core.http import HTTPClientDep, security
 from app.core.urls import MainUrls
 from app.core.constants import authenticated_headers
@@ -11,11 +12,19 @@ from app.core.constants import authenticated_headers
 async def result_list(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
+    refresh: bool = False,
 ):
-    return await client.get(
-        url=MainUrls.RESULT_LIST,
-        params={"a": "getResAll"},
-        headers=authenticated_headers(token.credentials),
+    params = {"a": "getResAll"}
+    return await response_cache.fetch(
+        "result_list",
+        token.credentials,
+        lambda: client.get(
+            url=MainUrls.RESULT_LIST,
+            params=params,
+            headers=authenticated_headers(token.credentials),
+        ),
+        params,
+        refresh=refresh,
     )
 
 
@@ -25,8 +34,14 @@ async def result(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-    return await client.get(
-        url=MainUrls.RESULT,
-        params={"a": "getResults", "examno": f"{exam_no}", "regno": f"{reg_no}"},
-        headers=authenticated_headers(token.credentials),
+    params = {"a": "getResults", "examno": f"{exam_no}", "regno": f"{reg_no}"}
+    return await response_cache.fetch(
+        "result",
+        token.credentials,
+        lambda: client.get(
+            url=MainUrls.RESULT,
+            params=params,
+            headers=authenticated_headers(token.credentials),
+        ),
+        params,
     )
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.core.cache import response_cache
 from app.core.http import HTTPClientDep, security
 from app.core.urls import MainUrls
 from app.core.constants import authenticated_headers
@@ -12,9 +13,12 @@ async def profile(
     token: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     client: HTTPClientDep,
 ):
-
-    return await client.get(
-        url=MainUrls.PROFILE, headers=authenticated_headers(token.credentials)
+    return await response_cache.fetch(
+        "profile",
+        token.credentials,
+        lambda: client.get(
+            url=MainUrls.PROFILE, headers=authenticated_headers(token.credentials)
+        ),
     )
 
 
@@ -0,0 +1,67 @@
+"""Throughput of the stock FastAPI encoding path vs EncodedResponse.
+
+"stdlib" is what routes did before: jsonable_encoder over the models followed
+by JSONResponse (json.dumps). The other columns render the same models with
+EncodedResponse for each negotiated media type.
+
+Run from backend/: python -m benchmarks.bench_encoding
+"""
+
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import EncodedResponse, _accept
+from app.schemas.notification import NOTIFICATION_MAP
+from app.schemas.result import RESULT_LIST_MAP, RESULT_MAP
+from benchmarks.payloads import (
+    notifications_payload,
+    result_list_payload,
+    result_payload,
+)
+
+CASES = {
+    "result list (8)": RESULT_LIST_MAP.map_many(result_list_payload(8)["data"]),
+    "notifications (20)": NOTIFICATION_MAP.map_many(notifications_payload(20)),
+    "ResultResponse (10)": RESULT_MAP.map(result_payload(10)),
+}
+
+
+def stdlib(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def encoded(media_type: str):
+    def render(content) -> bytes:
+        token = _accept.set(media_type)
+        try:
+            return EncodedResponse(content).body
+        finally:
+            _accept.reset(token)
+
+    return render
+
+
+def main(number: int = 2000) -> None:
+    renderers = {
+        "stdlib": stdlib,
+        "orjson": encoded("application/json"),
+        "msgpack": encoded("application/msgpack"),
+    }
+    for name, content in CASES.items():
+        row = [f"{name:<20}"]
+        baseline = None
+        for label, render in renderers.items():
+            size = len(render(content))
+            seconds = min(timeit.repeat(lambda: render(content), number=number, repeat=5))
+            per_second = number / seconds
+            baseline = baseline or per_second
+            row.append(
+                f"{label} {per_second:>8.0f}/s {size:>5}B ({per_second / baseline:.1f}x)"
+            )
+        print("  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare extract_json against the previous regex fallback on noisy bodies,
+with and without a JSON payload in them.
+
+Run from backend/: python -m benchmarks.bench_extract_json
+"""
+
+import timeit
+
+from app.core.utils import extract_json
+from benchmarks.fuzz_extract_json import legacy_extract_json, run
+
+PAYLOAD = '{"error_code":0,"msg":"Login Successful","status":"success"}'
+WARNING = (
+    "<br />\n<b>Warning</b>:  Undefined array key \"regno\" in "
+    "<b>/var/www/html/signin.php</b> on line <b>12</b><br />\n"
+)
+
+CASES = {
+    "php warning": WARNING + PAYLOAD + "\n<!-- end -->",
+    "64KB html page": (
+        "<html><body>" + "<div class=\"row\">{{ cell }}</div>\n" * 1800 + "</body></html>"
+        + PAYLOAD + "\nNotice: trailing output"
+    ),
+    "many warnings": WARNING * 500 + PAYLOAD + "\n<!-- end -->",
+    "unclosed braces": "{ " * 2000 + PAYLOAD + " trailing",
+    "brace-heavy css": "a { b: c } " * 5000 + PAYLOAD + " trailing",
+    # Error pages with no payload at all: every candidate has to be rejected.
+    "css error page": "a { b: c } " * 5000,
+    "placeholders": "{x}" * 80000,
+    "php fatal error": WARNING * 500 + "<b>Fatal error</b>: {main}() thrown",
+}
+
+
+def main(number: int = 50) -> None:
+    for name, text in CASES.items():
+        assert run(extract_json, text) == run(legacy_extract_json, text)
+        legacy = min(
+            timeit.repeat(lambda: run(legacy_extract_json, text), number=number, repeat=3)
+        )
+        scanner = min(timeit.repeat(lambda: run(extract_json, text), number=number, repeat=3))
+        print(
+            f"{name:<16} {len(text):>7}B  "
+            f"regex {legacy / number * 1e6:10.1f}us  "
+            f"scanner {scanner / number * 1e6:8.1f}us  "
+            f"({legacy / scanner:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare hand-written portal mapping against the FieldMap layer.
+
+Run from backend/: python -m benchmarks.bench_mapping
+"""
+
+import timeit
+
+import httpx
+
+from app.schemas.result import (
+    RESULT_MAP,
+    ResultInfo,
+    ResultResponse,
+    StudentDetail,
+    SubjectResult,
+)
+from benchmarks.payloads import encoded, result_payload
+
+
+def legacy_fetch_result(response: httpx.Response) -> ResultResponse:
+    return ResultResponse(
+        student_details=StudentDetail(
+            sem=response.json().get("studDet").get("FEXAMNAME"),
+            full_sem=response.json().get("studDet").get("FDESCPN"),
+            exam_date=response.json().get("studDet").get("FRESEXAMDATE"),
+            exam_no=response.json().get("studDet").get("FEXAMNO"),
+        ),
+        result=ResultInfo(
+            result=response.json().get("body")[0].get("result"),
+            cgpa=response.json().get("body")[0].get("FCGPA"),
+            sgpa=response.json().get("body")[0].get("FSGPA"),
+            percentage=response.json().get("body")[0].get("FPERCENT"),
+        ),
+        subjects=[
+            SubjectResult(
+                id=sub_result.get("sl_no"),
+                sub=sub_result.get("subject"),
+                exam_type=sub_result.get("mthprue"),
+                ese_marks=sub_result.get("uni_exam"),
+                viva_marks=sub_result.get("viva_exam"),
+                ia_marks=sub_result.get("ia_exam"),
+                total_marks=sub_result.get("thtot"),
+                credits=sub_result.get("FCREDITS"),
+                grade_points=sub_result.get("FGP"),
+                credit_points=sub_result.get("FCP"),
+                remarks=sub_result.get("remarks1"),
+                grade=sub_result.get("remarks"),
+            )
+            for sub_result in response.json().get("body")
+        ],
+    )
+
+
+def mapped_fetch_result(response: httpx.Response) -> ResultResponse:
+    return RESULT_MAP.map(response.json())
+
+
+def main(number: int = 2000) -> None:
+    for subjects in (6, 10, 16):
+        body = encoded(result_payload(subjects))
+        response = httpx.Response(200, content=body)
+        assert legacy_fetch_result(response) == mapped_fetch_result(response)
+
+        legacy = min(
+            timeit.repeat(lambda: legacy_fetch_result(response), number=number, repeat=5)
+        )
+        mapped = min(
+            timeit.repeat(lambda: mapped_fetch_result(response), number=number, repeat=5)
+        )
+        print(
+            f"fetch_result subjects={subjects:>2} body={len(body):>5}B  "
+            f"legacy {legacy / number * 1e6:8.1f}us  "
+            f"mapped {mapped / number * 1e6:8.1f}us  "
+            f"saved {(legacy - mapped) / number * 1e6:8.1f}us/request "
+            f"({legacy / mapped:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
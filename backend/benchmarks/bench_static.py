@@ -0,0 +1,142 @@
+"""SPA serving: the old StaticFiles + FileResponse path vs spa.py.
+
+"legacy" mounts plain StaticFiles and answers client-side routes with a
+FileResponse for index.html, as main.py did before. "current" uses
+PrecompressedStaticFiles and the in-memory SpaIndex. Both serve the same
+generated build (index.html plus a fingerprinted bundle with .br/.gz
+siblings) through the ASGI transport, so the numbers are server-side cost
+and bytes on the wire, not network time.
+
+Run from backend/: python -m benchmarks.bench_static
+"""
+
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, Header
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+
+from app.core.spa import PrecompressedStaticFiles, SpaIndex
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLE = "assets/index-Dx3kP9aQ.js"
+INDEX = """<!doctype html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+    <title>Uniclare Client</title>
+    <script type="module" crossorigin src="/static/{bundle}"></script>
+    <link rel="stylesheet" crossorigin href="/static/assets/index-B7c1Qm2x.css">
+  </head>
+  <body>
+    <div id="root"></div>
+{padding}
+  </body>
+</html>
+"""
+
+
+def build(directory: str) -> None:
+    os.makedirs(os.path.join(directory, "assets"))
+    files = {
+        "index.html": INDEX.format(
+            bundle=BUNDLE, padding="    <!-- preload hints -->\n" * 40
+        ).encode(),
+        BUNDLE: b"".join(
+            f"function c{i}(e){{return e.map(t=>t*{i}).filter(Boolean)}}\n".encode()
+            for i in range(8000)
+        ),
+    }
+    for name, content in files.items():
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(content, compresslevel=9))
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+
+
+def legacy_app(directory: str) -> FastAPI:
+    app = FastAPI()
+    app.mount("/static", StaticFiles(directory=directory), name="static")
+
+    @app.get("/{full_path:path}")
+    async def serve_spa(full_path: str):
+        return FileResponse(os.path.join(directory, "index.html"))
+
+    return app
+
+
+def current_app(directory: str) -> FastAPI:
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=directory), name="static")
+    index = SpaIndex(os.path.join(directory, "index.html"))
+
+    @app.get("/{full_path:path}")
+    async def serve_spa(
+        full_path: str,
+        accept_encoding: str = Header(""),
+        if_none_match: str | None = Header(None),
+    ):
+        return index.response(accept_encoding, if_none_match)
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, headers: dict, number: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(path, headers=headers)
+        wire = int(response.headers.get("content-length", len(response.content)))
+        start = time.perf_counter()
+        for _ in range(number):
+            await client.get(path, headers=headers)
+        elapsed = time.perf_counter() - start
+    return number / elapsed, wire, response
+
+
+async def main(number: int = 2000) -> None:
+    encodings = "br, gzip" if brotli is not None else "gzip"
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory)
+        apps = {"legacy": legacy_app(directory), "current": current_app(directory)}
+        _, _, first = await measure(
+            apps["current"], "/results", {"accept-encoding": encodings}, 1
+        )
+        cases = {
+            "spa route": ("/results", {"accept-encoding": encodings}),
+            "spa route (revalidate)": (
+                "/results",
+                {"accept-encoding": encodings, "if-none-match": first.headers["etag"]},
+            ),
+            "bundle": (f"/static/{BUNDLE}", {"accept-encoding": encodings}),
+        }
+        for name, (path, headers) in cases.items():
+            row = [f"{name:<24}"]
+            baseline = None
+            for label, app in apps.items():
+                per_second, wire, response = await measure(app, path, headers, number)
+                baseline = baseline or per_second
+                row.append(
+                    f"{label} {per_second:>7.0f}/s {response.status_code} "
+                    f"{wire:>7}B ({per_second / baseline:.1f}x)"
+                )
+            print("  ".join(row))
+            cache_control = response.headers.get("cache-control", "-")
+            print(f"{'':<24}  current Cache-Control: {cache_control}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""Differential fuzzing of extract_json against the previous regex version.
+
+Runs the checked-in corpus of noisy signin.php bodies (each ``.txt`` has a
+``.json`` sibling holding the expected result; no sibling means "no JSON")
+plus randomly generated variants. Wherever the old implementation produced a value the new scanner
+must produce the same one; for payloads nested deeper than the old regex
+could see, the new scanner must return the real payload.
+
+Run from backend/: python -m benchmarks.fuzz_extract_json [iterations] [seed]
+"""
+
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+from app.core.utils import extract_json
+
+CORPUS_DIR = Path(__file__).parent / "corpus" / "signin"
+
+NOISE = [
+    "<br />\n<b>Warning</b>:  Undefined variable $x in <b>/var/www/html/signin.php</b> on line <b>{n}</b><br />\n",
+    "<b>Notice</b>: Trying to access array offset on value of type null in /var/www/db.php:{n}\n",
+    "<html><body><h1>Error {n}</h1><p>style=\"a{{b}}\"</p></body></html>\n",
+    "Deprecated: Function mysql_connect() is deprecated {{ in line {n}\n",
+    "<script>var x = {{\"n\": {n}}};</script>\n",
+    "}} stray closing brace {n}\n",
+    "\"unbalanced quote {n}\n",
+    "\\\\ backslashes \\\" {n}\n",
+]
+
+
+def legacy_extract_json(text: str) -> dict:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if lines:
+        last = lines[-1]
+        if last.startswith("{") and last.endswith("}"):
+            try:
+                return json.loads(last)
+            except json.JSONDecodeError:
+                pass
+
+    matches = list(re.finditer(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text, re.DOTALL))
+    if matches:
+        candidate = matches[-1].group()
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+
+    raise ValueError("No valid JSON found in the response.")
+
+
+def run(fn, text):
+    try:
+        return fn(text)
+    except ValueError:
+        return ValueError
+
+
+def depth(value) -> int:
+    if isinstance(value, dict):
+        return 1 + max((depth(v) for v in value.values()), default=0)
+    if isinstance(value, list):
+        return max((depth(v) for v in value), default=0)
+    return 0
+
+
+def random_payload(rng: random.Random, max_depth: int):
+    payload = {
+        "error_code": rng.randint(0, 3),
+        "msg": rng.choice(["Login Successful", "Invalid {user}", 'say "}"', "a\\b"]),
+    }
+    node = payload
+    for level in range(rng.randint(0, max_depth)):
+        node["data"] = {"level": level, "items": [level, {"k": "}{"}]}
+        node = node["data"]
+    return payload
+
+
+def random_body(rng: random.Random) -> tuple[str, dict]:
+    payload = random_payload(rng, max_depth=3)
+    encoded = json.dumps(payload, separators=rng.choice([(",", ":"), (", ", ": ")]))
+    before = "".join(
+        rng.choice(NOISE).format(n=rng.randint(1, 999)) for _ in range(rng.randint(0, 4))
+    )
+    after = rng.choice(["", "\n", "   \n", "\n<!-- end -->\n", "\n\n"])
+    inline = rng.random() < 0.3
+    return before + ("" if inline else "\n") + encoded + after, payload
+
+
+def check(text: str, expected=None) -> str:
+    old = run(legacy_extract_json, text)
+    new = run(extract_json, text)
+    if expected is not None and depth(expected) > 2:
+        assert new == expected, f"deep payload not recovered:\n{text!r}\n-> {new!r}"
+        return "deep"
+    if old is not ValueError:
+        assert new == old, f"mismatch:\n{text!r}\nold={old!r}\nnew={new!r}"
+        return "same"
+    return "recovered" if new is not ValueError else "both-failed"
+
+
+def main(iterations: int = 20000, seed: int = 0) -> None:
+    outcomes: dict[str, int] = {}
+    for path in sorted(CORPUS_DIR.glob("*.txt")):
+        text = path.read_text(encoding="utf-8-sig")
+        expected_path = path.with_suffix(".json")
+        expected = (
+            json.loads(expected_path.read_text()) if expected_path.exists() else ValueError
+        )
+        actual = run(extract_json, text)
+        assert actual == expected, f"{path.name}: expected {expected!r}, got {actual!r}"
+        print(f"corpus {path.name:<22} ok  {actual!r}")
+
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        text, payload = random_body(rng)
+        outcome = check(text, payload)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    print(f"{iterations} generated bodies (seed={seed}): {outcomes}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
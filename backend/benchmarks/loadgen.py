@@ -0,0 +1,164 @@
+"""Open-loop load generator for the /api routes.
+
+Requests are started on a fixed schedule at the target rate whether or not
+earlier ones have finished, so a slow backend shows up as latency and errors
+rather than as a quietly lower request rate. Logs in once through
+/api/auth/login (or uses --token), then drives a weighted mix of routes and
+reports throughput, status codes and latency percentiles per route.
+
+    python -m benchmarks.portal_sim --port 9000 &
+    API_BASE_URL=http://127.0.0.1:9000 uvicorn app.main:app --port 8000 &
+    python -m benchmarks.loadgen --rps 200 --duration 30
+
+Run from backend/.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+DEFAULT_MIX = {
+    "/api/result": 4,
+    "/api/result/25?reg_no=U01AB22S0001": 3,
+    "/api/user": 2,
+    "/api/notifications": 2,
+    "/api/result/all": 1,
+}
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def parse_mix(values: list[str]) -> dict[str, float]:
+    mix = {}
+    for value in values:
+        path, _, weight = value.rpartition("=")
+        if not path:
+            path, weight = weight, "1"
+        mix[path] = float(weight)
+    return mix
+
+
+async def login(client: httpx.AsyncClient, mobile: str, password: str) -> str:
+    response = await client.post(
+        "/api/auth/login", params={"mobile_no": mobile, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["session_id"]
+
+
+async def run(args: argparse.Namespace) -> None:
+    mix = parse_mix(args.path) if args.path else DEFAULT_MIX
+    paths, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(
+        max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight
+    )
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, Counter] = defaultdict(Counter)
+    dropped = 0
+
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        token = args.token or await login(client, args.mobile, args.password)
+        headers = {"Authorization": f"Bearer {token}", "Accept": args.accept}
+        slots = asyncio.Semaphore(args.max_in_flight)
+
+        async def one(path: str) -> None:
+            start_time = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                outcome = str(response.status_code)
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            except httpx.HTTPError as exc:
+                outcome = type(exc).__name__
+            finally:
+                slots.release()
+            latencies[path].append(time.perf_counter() - start_time)
+            statuses[path][outcome] += 1
+
+        total = int(args.rps * args.duration)
+        tasks = []
+        start = time.perf_counter()
+        for i in range(total):
+            delay = start + i / args.rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if slots.locked():
+                dropped += 1
+                continue
+            await slots.acquire()
+            path = random.choices(paths, weights)[0]
+            tasks.append(asyncio.create_task(one(path)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    completed = sum(len(values) for values in latencies.values())
+    print(
+        f"{completed} requests in {elapsed:.2f}s "
+        f"({completed / elapsed:.1f} req/s, target {args.rps}), "
+        f"{dropped} dropped at max-in-flight {args.max_in_flight}"
+    )
+    print(
+        f"{'route':<40} {'count':>7} {'p50':>8} {'p90':>8} {'p99':>8} "
+        f"{'max':>8}  status"
+    )
+    everything: list[float] = []
+    for path in sorted(latencies):
+        ordered = sorted(latencies[path])
+        everything.extend(ordered)
+        codes = " ".join(f"{code}:{n}" for code, n in statuses[path].most_common())
+        print(
+            f"{path[:40]:<40} {len(ordered):>7} "
+            + " ".join(
+                f"{percentile(ordered, q) * 1000:>6.1f}ms" for q in (0.5, 0.9, 0.99)
+            )
+            + f" {ordered[-1] * 1000:>6.1f}ms  {codes}"
+        )
+    everything.sort()
+    if everything:
+        print(
+            f"{'all':<40} {len(everything):>7} "
+            + " ".join(
+                f"{percentile(everything, q) * 1000:>6.1f}ms"
+                for q in (0.5, 0.9, 0.99)
+            )
+            + f" {everything[-1] * 1000:>6.1f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--path",
+        action="append",
+        default=[],
+        metavar="PATH=WEIGHT",
+        help="route to request (repeatable); defaults to a mix of the GET routes",
+    )
+    parser.add_argument("--accept", default="application/json")
+    parser.add_argument("--token", help="session id to use instead of logging in")
+    parser.add_argument("--mobile", default="9999999999")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import json
+
+
+def result_payload(subjects: int = 10) -> dict:
+    return {
+        "studDet": {
+            "FEXAMNAME": "SEM 5",
+            "FDESCPN": "B.Sc. Fifth Semester",
+            "FRESEXAMDATE": "NOV-2025",
+            "FEXAMNO": "25",
+        },
+        "body": [
+            {
+                "sl_no": str(i + 1),
+                "subject": f"SUBJECT {i + 1}",
+                "mthprue": "TH",
+                "uni_exam": "52",
+                "viva_exam": "",
+                "ia_exam": "18",
+                "thtot": "70",
+                "FCREDITS": "4",
+                "FGP": "7",
+                "FCP": "28",
+                "remarks1": "",
+                "remarks": "A",
+                "result": "PASS",
+                "FCGPA": "7.45",
+                "FSGPA": "7.80",
+                "FPERCENT": "70.00",
+            }
+            for i in range(subjects)
+        ],
+    }
+
+
+def result_list_payload(exams: int = 8) -> dict:
+    return {
+        "data": [
+            {
+                "year": str(20 + i),
+                "examdate": "NOV-2025",
+                "examname": f"SEM {i + 1}",
+                "resultdate": "2026-01-10",
+                "rvresultdate": "",
+                "regno": "U01AB22S0001",
+                "mcnumber": f"MC{i:05d}",
+                "class": "FIRST CLASS",
+            }
+            for i in range(exams)
+        ]
+    }
+
+
+def profile_payload() -> dict:
+    return {
+        "fname": "STUDENT NAME",
+        "ffatname": "FATHER NAME",
+        "fmotname": "MOTHER NAME",
+        "fdegree": "B.Sc.",
+        "fdeggrp": "BSC",
+        "college": "GOVERNMENT COLLEGE",
+        "fcollcode": "U01",
+        "photo": "https://studentportal.universitysolutions.in/photos/U01AB22S0001.jpg",
+        "category": "GM",
+        "feetype": "REGULAR",
+        "strRegno": "U01AB22S0001",
+        "strMobile": "9999999999",
+        "strEmail": "student@example.com",
+        "strParentMob": "8888888888",
+    }
+
+
+def notifications_payload(items: int = 20) -> list:
+    return [
+        {
+            "ftitle": f"Notification {i}",
+            "fbody": "Results for the November 2025 examination are announced.",
+            "fpushdate": "2026-01-10 10:00:00",
+        }
+        for i in range(items)
+    ]
+
+
+def encoded(payload) -> bytes:
+    return json.dumps(payload).encode()
@@ -0,0 +1,246 @@
+"""Local stand-in for the university portal, for load tests.
+
+Serves the endpoints in app/core/urls.py with payloads shaped like the real
+ones (see benchmarks.payloads), including the PHP warning the real signin.php
+prints ahead of its JSON. Latency, error rate and hangs are configurable, both
+globally and per endpoint:
+
+    python -m benchmarks.portal_sim --port 9000 \\
+        --latency lognormal:0.15,0.6 --latency-for result=uniform:0.5,3 \\
+        --error-rate 0.02 --hang-rate 0.001
+
+Latency specs: fixed:S, uniform:LO,HI, lognormal:MEDIAN,SIGMA (seconds).
+Point the backend at it with API_BASE_URL=http://127.0.0.1:9000.
+
+Run from backend/.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import secrets
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import parse_qsl
+
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from benchmarks.payloads import (
+    notifications_payload,
+    profile_payload,
+    result_list_payload,
+    result_payload,
+)
+
+SIGNIN_WARNING = (
+    "<br />\n<b>Warning</b>:  Undefined array key \"fyear\" in "
+    "<b>/var/www/html/signin.php</b> on line <b>42</b><br />\n"
+)
+FATAL_ERROR = (
+    "<br />\n<b>Fatal error</b>:  Maximum execution time of 30 seconds exceeded "
+    "in <b>/var/www/html/src/results_new.php</b> on line <b>118</b><br />\n"
+)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    kind, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",") if value]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        low, high = values
+        return lambda: random.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = values
+        mu = math.log(median)
+        return lambda: random.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+@dataclass
+class Behaviour:
+    latency: Callable[[], float] = lambda: 0.0
+    overrides: dict[str, Callable[[], float]] = field(default_factory=dict)
+    error_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_seconds: float = 600.0
+    exams: int = 8
+    subjects: int = 10
+    calls: dict[str, int] = field(default_factory=dict)
+
+    async def delay(self, endpoint: str) -> bool:
+        # Returns False when the call should fail with a server error.
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+        roll = random.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(self.hang_seconds)
+        await asyncio.sleep(self.overrides.get(endpoint, self.latency)())
+        return roll >= self.hang_rate + self.error_rate
+
+
+behaviour = Behaviour()
+
+
+def json_response(content, headers: dict | None = None) -> Response:
+    # The portal labels its JSON as text/html.
+    return Response(
+        orjson.dumps(content), media_type="text/html; charset=UTF-8", headers=headers
+    )
+
+
+def server_error() -> Response:
+    return Response(FATAL_ERROR, status_code=500, media_type="text/html")
+
+
+async def form(request: Request) -> dict[str, str]:
+    # The portal only ever receives urlencoded bodies; parsing them here
+    # avoids needing python-multipart for Request.form().
+    return dict(parse_qsl((await request.body()).decode()))
+
+
+def session(request: Request) -> str | None:
+    return request.cookies.get("PHPSESSID")
+
+
+def unauthorized() -> Response:
+    return json_response({"error_code": 1, "msg": "Session expired"})
+
+
+async def signin(request: Request) -> Response:
+    if not await behaviour.delay("signin"):
+        return server_error()
+    data = await form(request)
+    if not data.get("regno") or not data.get("passwd"):
+        return Response(
+            SIGNIN_WARNING + '{"error_code":1,"msg":"Invalid credentials"}',
+            media_type="text/html",
+        )
+    response = Response(
+        SIGNIN_WARNING + '{"error_code":0,"msg":"Login successful"}',
+        media_type="text/html",
+    )
+    response.set_cookie("PHPSESSID", secrets.token_hex(13), path="/")
+    return response
+
+
+async def signout(request: Request) -> Response:
+    await behaviour.delay("signout")
+    return json_response({"error_code": 0, "msg": "Logged out"})
+
+
+async def profile(request: Request) -> Response:
+    if not await behaviour.delay("profile"):
+        return server_error()
+    if session(request) is None:
+        return unauthorized()
+    return json_response(profile_payload())
+
+
+async def notifications(request: Request) -> Response:
+    if not await behaviour.delay("notifications"):
+        return server_error()
+    if session(request) is None:
+        return unauthorized()
+    return json_response(notifications_payload())
+
+
+async def results(request: Request) -> Response:
+    action = request.query_params.get("a")
+    endpoint = "result_list" if action == "getResAll" else "result"
+    if not await behaviour.delay(endpoint):
+        return server_error()
+    if session(request) is None:
+        return unauthorized()
+    if action == "getResAll":
+        return json_response(result_list_payload(behaviour.exams))
+    if action == "getResults":
+        payload = result_payload(behaviour.subjects)
+        payload["studDet"]["FEXAMNO"] = request.query_params.get("examno", "")
+        return json_response(payload)
+    return json_response({"error_code": 1, "msg": "Unknown action"})
+
+
+async def password(request: Request) -> Response:
+    if not await behaviour.delay("password"):
+        return server_error()
+    if session(request) is None:
+        return unauthorized()
+    if not (await form(request)).get("passwd"):
+        return json_response({"error_code": 1, "data": "Password required"})
+    return json_response({"error_code": 0, "status": "success", "msg": "Updated"})
+
+
+async def otp(request: Request) -> Response:
+    if not await behaviour.delay("otp"):
+        return server_error()
+    return json_response({"error_code": 0, "msg": "OTP sent"})
+
+
+async def reset_password(request: Request) -> Response:
+    if not await behaviour.delay("reset_password"):
+        return server_error()
+    return json_response({"error_code": 0, "msg": "Password reset"})
+
+
+async def stats(request: Request) -> Response:
+    return json_response(behaviour.calls)
+
+
+app = Starlette(
+    routes=[
+        Route("/signin.php", signin, methods=["POST"]),
+        Route("/forgot-password.php", otp, methods=["POST"]),
+        Route("/resetpassword.php", reset_password, methods=["POST"]),
+        Route("/src/logout.php", signout, methods=["POST"]),
+        Route("/src/profile.php", profile, methods=["GET"]),
+        Route("/src/notificationstatus.php", notifications, methods=["GET"]),
+        Route("/src/results_new.php", results, methods=["GET"]),
+        Route("/src/chngPassword.php", password, methods=["POST"]),
+        Route("/_stats", stats, methods=["GET"]),
+    ]
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="lognormal:0.15,0.6")
+    parser.add_argument(
+        "--latency-for",
+        action="append",
+        default=[],
+        metavar="ENDPOINT=SPEC",
+        help="per-endpoint latency, e.g. result=uniform:0.5,3",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=600.0)
+    parser.add_argument("--exams", type=int, default=8)
+    parser.add_argument("--subjects", type=int, default=10)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    behaviour.latency = parse_latency(args.latency)
+    for override in args.latency_for:
+        endpoint, _, spec = override.partition("=")
+        behaviour.overrides[endpoint] = parse_latency(spec)
+    behaviour.error_rate = args.error_rate
+    behaviour.hang_rate = args.hang_rate
+    behaviour.hang_seconds = args.hang_seconds
+    behaviour.exams = args.exams
+    behaviour.subjects = args.subjects
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
-import socket
+from app.core.startup import startup_profiler
+
+import sys
 import threading
-import time
 
-import uvicorn
 import webview
 
 from app.core.config import settings
-from app.main import app
+
+startup_profiler.mark("desktop imports")
 
 HOST = settings.webview_host
 PORT = settings.webview_port
@@ -46,27 +47,65 @@ SPLASH_HTML = """<!DOCTYPE html>
 """
 
 
+ERROR_HTML = """<!DOCTYPE html>
+<html lang="en">
+<body style="margin:0;height:100vh;display:flex;align-items:center;justify-content:center;background-color:#111827;color:#ffffff;font-family:system-ui,sans-serif;">
+  <p>Could not start the local server on {host}:{port}. Is another copy already running?</p>
+</body>
+</html>
+"""
+
+# Set once the server has either started or given up.
+server_ready = threading.Event()
+server = None
+
+
 def run_server() -> None:
-    uvicorn.run(
-        app,
-        host=HOST,
-        port=PORT,
-        reload=False,
-        log_level="error",
-    )
+    # The app, its routers and uvicorn are imported here, on the server
+    # thread, so the splash window does not wait for them.
+    global server
+    try:
+        with startup_profiler.span("import uvicorn"):
+            import uvicorn
+
+            from app.core.server import ReadyServer
+        with startup_profiler.span("import app.main"):
+            from app.main import app
+
+        server = ReadyServer(
+            uvicorn.Config(app, host=HOST, port=PORT, reload=False, log_level="error"),
+            ready=server_ready,
+        )
+        server.run()
+    finally:
+        server_ready.set()
+
+
+def report_first_render() -> None:
+    startup_profiler.mark("first render")
+    print(startup_profiler.report(), file=sys.stderr)
 
 
 def navigate_when_ready(window: webview.Window) -> None:
-    while True:
-        try:
-            with socket.create_connection((HOST, PORT), timeout=1):
-                break
-        except OSError:
-            time.sleep(0.05)
+    server_ready.wait()
+    if server is None or not server.started:
+        window.load_html(ERROR_HTML.format(host=HOST, port=PORT))
+        return
+    startup_profiler.mark("server ready")
+    if settings.startup_profile:
+        rendered = threading.Event()
+
+        def on_loaded() -> None:
+            if not rendered.is_set():
+                rendered.set()
+                report_first_render()
+
+        window.events.loaded += on_loaded
     window.load_url(f"http://{HOST}:{PORT}")
 
 
 def on_start(window: webview.Window) -> None:
+    startup_profiler.mark("window shown")
     threading.Thread(target=navigate_when_ready, args=(window,), daemon=True).start()
 
 
@@ -2,6 +2,11 @@ const BASE_URL =
   (import.meta.env.VITE_API_BASE_URL ?? window.location.origin)
     .replace(/\/+$/, "") + "/api";
 
+// Resolves links the API hands out (e.g. profile photos) against its origin.
+export function apiUrl(path: string): string {
+  return path.startsWith("/api/") ? BASE_URL + path.slice(4) : path;
+}
+
 function getToken(): string {
   return localStorage.getItem("session_token") || "";
 }
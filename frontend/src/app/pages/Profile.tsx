@@ -2,7 +2,7 @@ import { useEffect, useState } from "react";
 import { User, Mail, Phone, Hash, BookOpen, Building2, Tag, CreditCard } from "lucide-react";
 import { Loader } from "../components/Loader";
 import { ErrorMessage } from "../components/ErrorMessage";
-import { api } from "../lib/api";
+import { api, apiUrl } from "../lib/api";
 
 type ProfileData = Awaited<ReturnType<typeof api.getProfile>>;
 
@@ -59,7 +59,7 @@ export function Profile() {
         <div className="flex items-center gap-4 mb-6 pb-6 border-b border-border">
           {profile.photo ? (
             <img
-              src={profile.photo}
+              src={`${apiUrl(profile.photo)}?size=128`}
               alt={profile.full_name}
               className="h-16 w-16 rounded-full object-cover"
             />
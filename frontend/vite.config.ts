@@ -1,6 +1,8 @@
 import tailwindcss from '@tailwindcss/vite'
 import react from '@vitejs/plugin-react'
+import fs from 'fs'
 import path from 'path'
+import zlib from 'zlib'
 import { defineConfig, loadEnv } from 'vite'
 
 
@@ -15,6 +17,42 @@ function figmaAssetResolver() {
     },
   }
 }
+// Writes .br and .gz siblings next to compressible build output so the backend
+// can serve them without compressing on every request.
+function precompress() {
+  const compressible = /\.(js|mjs|css|html|svg|json|txt|csv|map)$/
+  let outDir = ''
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      const walk = (dir) =>
+        fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+          const file = path.join(dir, entry.name)
+          return entry.isDirectory() ? walk(file) : [file]
+        })
+      for (const file of walk(outDir)) {
+        if (!compressible.test(file)) continue
+        const content = fs.readFileSync(file)
+        if (content.length < 1024) continue
+        fs.writeFileSync(`${file}.gz`, zlib.gzipSync(content, { level: 9 }))
+        fs.writeFileSync(
+          `${file}.br`,
+          zlib.brotliCompressSync(content, {
+            params: {
+              [zlib.constants.BROTLI_PARAM_QUALITY]: 11,
+              [zlib.constants.BROTLI_PARAM_SIZE_HINT]: content.length,
+            },
+          }),
+        )
+      }
+    },
+  }
+}
+
 export default defineConfig(({ mode }) => {  
   const env = loadEnv(mode, process.cwd(), '')
   const outDir = env.BUILD_OUT_DIR || '../backend/app/static'
@@ -26,6 +64,7 @@ export default defineConfig(({ mode }) => {
       figmaAssetResolver(),
       react(),
       tailwindcss(),
+      precompress(),
     ],
     base, 
     build: {